@@ -0,0 +1,20 @@
+// RUN: xdsl-smt "%s" -p=lower-effects | filecheck "%s"
+
+// Check that UB states nested in other types are lowered, and that types and
+// attributes without UB states are left unchanged.
+
+"builtin.module"() ({
+  %0 = "smt.define_fun"() ({
+  ^0(%arg : !smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, %ub : !smt.utils.pair<!smt_ub.ub_state, !smt.bv.bv<32>>):
+    %1 = "smt.utils.first"(%ub) {"dict" = {"width" = 32 : i32}} : (!smt.utils.pair<!smt_ub.ub_state, !smt.bv.bv<32>>) -> !smt_ub.ub_state
+    %2 = "smt.utils.pair"(%arg, %1) : (!smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, !smt_ub.ub_state) -> !smt.utils.pair<!smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, !smt_ub.ub_state>
+    "smt.return"(%2) : (!smt.utils.pair<!smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, !smt_ub.ub_state>) -> ()
+  }) {"fun_name" = "test"} : () -> ((!smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, !smt.utils.pair<!smt_ub.ub_state, !smt.bv.bv<32>>) -> !smt.utils.pair<!smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, !smt_ub.ub_state>)
+}) : () -> ()
+
+// CHECK:      %0 = "smt.define_fun"() ({
+// CHECK-NEXT: ^0(%arg : !smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, %ub : !smt.utils.pair<!smt.bool, !smt.bv.bv<32>>):
+// CHECK-NEXT:   %1 = "smt.utils.first"(%ub) {"dict" = {"width" = 32 : i32}} : (!smt.utils.pair<!smt.bool, !smt.bv.bv<32>>) -> !smt.bool
+// CHECK-NEXT:   %2 = "smt.utils.pair"(%arg, %1) : (!smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, !smt.bool) -> !smt.utils.pair<!smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, !smt.bool>
+// CHECK-NEXT:   "smt.return"(%2) : (!smt.utils.pair<!smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, !smt.bool>) -> ()
+// CHECK-NEXT: }) {"fun_name" = "test"} : () -> ((!smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, !smt.utils.pair<!smt.bool, !smt.bv.bv<32>>) -> !smt.utils.pair<!smt.utils.pair<!smt.bv.bv<32>, !smt.bool>, !smt.bool>)
@@ -0,0 +1,62 @@
+// RUN: xdsl-smt "%s" -p=lower-to-smt,lower-effects,canonicalize-smt -t=smt | filecheck "%s"
+
+// Check that constants and algebraic identities are folded during the lowering.
+
+builtin.module {
+  "func.func"() ({
+  ^0(%x: i32):
+    %zero = "hw.constant"() {"value" = 0 : i32} : () -> i32
+    %r = "comb.add"(%x, %zero) : (i32, i32) -> i32
+    "func.return"(%r) : (i32) -> ()
+  }) {"sym_name" = "add_zero", "function_type" = (i32) -> i32, "sym_visibility" = "private"} : () -> ()
+
+  "func.func"() ({
+  ^0(%x: i32):
+    %zero = "hw.constant"() {"value" = 0 : i32} : () -> i32
+    %r = "comb.mul"(%x, %zero) : (i32, i32) -> i32
+    "func.return"(%r) : (i32) -> ()
+  }) {"sym_name" = "mul_zero", "function_type" = (i32) -> i32, "sym_visibility" = "private"} : () -> ()
+
+  "func.func"() ({
+  ^0(%x: i32):
+    %ones = "hw.constant"() {"value" = -1 : i32} : () -> i32
+    %r = "comb.and"(%ones, %x) : (i32, i32) -> i32
+    "func.return"(%r) : (i32) -> ()
+  }) {"sym_name" = "and_ones", "function_type" = (i32) -> i32, "sym_visibility" = "private"} : () -> ()
+
+  "func.func"() ({
+  ^0(%x: i32):
+    %r = "comb.sub"(%x, %x) : (i32, i32) -> i32
+    "func.return"(%r) : (i32) -> ()
+  }) {"sym_name" = "sub_self", "function_type" = (i32) -> i32, "sym_visibility" = "private"} : () -> ()
+
+  "func.func"() ({
+  ^0():
+    %a = "hw.constant"() {"value" = 3 : i32} : () -> i32
+    %b = "hw.constant"() {"value" = 4 : i32} : () -> i32
+    %r = "comb.xor"(%a, %b) : (i32, i32) -> i32
+    "func.return"(%r) : (i32) -> ()
+  }) {"sym_name" = "xor_constants", "function_type" = () -> i32, "sym_visibility" = "private"} : () -> ()
+
+  "func.func"() ({
+  ^0():
+    %a = "hw.constant"() {"value" = 100 : i8} : () -> i8
+    %b = "hw.constant"() {"value" = 120 : i8} : () -> i8
+    %c = "hw.constant"() {"value" = 50 : i8} : () -> i8
+    %r = "comb.add"(%a, %b, %c) : (i8, i8, i8) -> i8
+    "func.return"(%r) : (i8) -> ()
+  }) {"sym_name" = "add_constants", "function_type" = () -> i8, "sym_visibility" = "private"} : () -> ()
+}
+
+// CHECK:      (define-fun add_zero ((x (Pair (_ BitVec 32) Bool)) (tmp Bool)) (Pair (Pair (_ BitVec 32) Bool) Bool)
+// CHECK-NEXT:   (pair (pair (first x) (second x)) tmp))
+// CHECK-NEXT: (define-fun mul_zero ((x_0 (Pair (_ BitVec 32) Bool)) (tmp_0 Bool)) (Pair (Pair (_ BitVec 32) Bool) Bool)
+// CHECK-NEXT:   (pair (pair (_ bv0 32) (second x_0)) tmp_0))
+// CHECK-NEXT: (define-fun and_ones ((x_1 (Pair (_ BitVec 32) Bool)) (tmp_1 Bool)) (Pair (Pair (_ BitVec 32) Bool) Bool)
+// CHECK-NEXT:   (pair (pair (first x_1) (second x_1)) tmp_1))
+// CHECK-NEXT: (define-fun sub_self ((x_2 (Pair (_ BitVec 32) Bool)) (tmp_2 Bool)) (Pair (Pair (_ BitVec 32) Bool) Bool)
+// CHECK-NEXT:   (pair (pair (_ bv0 32) (second x_2)) tmp_2))
+// CHECK-NEXT: (define-fun xor_constants ((tmp_3 Bool)) (Pair (Pair (_ BitVec 32) Bool) Bool)
+// CHECK-NEXT:   (pair (pair (_ bv7 32) false) tmp_3))
+// CHECK-NEXT: (define-fun add_constants ((tmp_4 Bool)) (Pair (Pair (_ BitVec 8) Bool) Bool)
+// CHECK-NEXT:   (pair (pair (_ bv14 8) false) tmp_4))
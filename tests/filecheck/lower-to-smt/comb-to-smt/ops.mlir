@@ -30,6 +30,15 @@ builtin.module {
 // CHECK-NEXT:  (define-fun add_three ((x_1 (Pair (_ BitVec 32) Bool)) (y_0 (Pair (_ BitVec 32) Bool)) (z (Pair (_ BitVec 32) Bool)) (tmp_1 Bool)) (Pair (Pair (_ BitVec 32) Bool) Bool)
 // CHECK-NEXT:    (pair (pair (bvadd (bvadd (first x_1) (first y_0)) (first z)) (or (or (second x_1) (second y_0)) (second z))) tmp_1))
 
+  "func.func"() ({
+  ^0(%x: i32, %y: i32, %z: i32, %w: i32):
+    %r = "comb.add"(%x, %y, %z, %w) : (i32, i32, i32, i32) -> i32
+    "func.return"(%r) : (i32) -> ()
+  }) {"sym_name" = "add_four", "function_type" = (i32, i32, i32, i32) -> i32, "sym_visibility" = "private"} : () -> ()
+
+// CHECK-NEXT:  (define-fun add_four ((x_2 (Pair (_ BitVec 32) Bool)) (y_1 (Pair (_ BitVec 32) Bool)) (z_0 (Pair (_ BitVec 32) Bool)) (w (Pair (_ BitVec 32) Bool)) (tmp_2 Bool)) (Pair (Pair (_ BitVec 32) Bool) Bool)
+// CHECK-NEXT:    (pair (pair (bvadd (bvadd (first x_2) (first y_1)) (bvadd (first z_0) (first w))) (or (or (or (second x_2) (second y_1)) (second z_0)) (second w))) tmp_2))
+
 }
 
 // -----
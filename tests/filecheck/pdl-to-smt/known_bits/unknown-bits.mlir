@@ -0,0 +1,24 @@
+// RUN: xdsl-smt "%s" -p=pdl-to-smt,lower-effects -t smt | filecheck "%s"
+// RUN: xdsl-smt "%s" -p=pdl-to-smt,lower-effects -t smt | z3 -in | filecheck "%s" --check-prefix=Z3
+
+// Check that an analysis that knows no bits is trivially correct, so that the
+// negated conjunction folds to false.
+
+builtin.module {
+  pdl.pattern @andi_unknown : benefit(0) {
+    %type = pdl.type : i8
+    %x = pdl.operand : %type
+    %x_zeros, %x_ones = "pdl.dataflow.get"(%x) {"domain_name" = "kb"} : (!pdl.value) -> (!transfer.integer, !transfer.integer)
+    %op = pdl.operation "arith.andi"(%x, %x : !pdl.value, !pdl.value) -> (%type : !pdl.type)
+    pdl.rewrite %op {
+      %unknown = "transfer.constant"(%x_zeros) {"value" = 0 : index} : (!transfer.integer) -> !transfer.integer
+      %res = pdl.result 0 of %op
+      "pdl.dataflow.attach"(%res, %unknown, %unknown) {"domain_name" = "kb"} : (!pdl.value, !transfer.integer, !transfer.integer) -> ()
+    }
+  }
+}
+
+// CHECK:      (assert false)
+// CHECK-NEXT: (check-sat)
+
+// Z3: unsat
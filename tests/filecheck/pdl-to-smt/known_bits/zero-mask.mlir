@@ -0,0 +1,34 @@
+// RUN: xdsl-smt "%s" -p=pdl-to-smt,lower-effects -t smt | filecheck "%s"
+// RUN: xdsl-smt "%s" -p=pdl-to-smt,lower-effects -t smt | z3 -in | filecheck "%s" --check-prefix=Z3
+
+// Check that a constant zero mask is not checked, and that the preconditions of
+// both operands are conjoined once.
+
+builtin.module {
+  pdl.pattern @andi_zeros : benefit(0) {
+    %type = pdl.type : i8
+    %x = pdl.operand : %type
+    %y = pdl.operand : %type
+    %x_zeros, %x_ones = "pdl.dataflow.get"(%x) {"domain_name" = "kb"} : (!pdl.value) -> (!transfer.integer, !transfer.integer)
+    %y_zeros, %y_ones = "pdl.dataflow.get"(%y) {"domain_name" = "kb"} : (!pdl.value) -> (!transfer.integer, !transfer.integer)
+    %op = pdl.operation "arith.andi"(%x, %y : !pdl.value, !pdl.value) -> (%type : !pdl.type)
+    pdl.rewrite %op {
+      %zeros = "transfer.or"(%x_zeros, %y_zeros) : (!transfer.integer, !transfer.integer) -> !transfer.integer
+      %no_ones = "transfer.constant"(%x_ones) {"value" = 0 : index} : (!transfer.integer) -> !transfer.integer
+      %res = pdl.result 0 of %op
+      "pdl.dataflow.attach"(%res, %zeros, %no_ones) {"domain_name" = "kb"} : (!pdl.value, !transfer.integer, !transfer.integer) -> ()
+    }
+  }
+}
+
+// CHECK:      (assert (let ((tmp_0 (first y)))
+// CHECK-NEXT:   (let ((tmp_1 (_ bv0 8)))
+// CHECK-NEXT:   (let ((tmp_2 (and (= (bvand tmp_0 y_zeros) tmp_1) (= (bvand tmp_0 y_ones) y_ones))))
+// CHECK-NEXT:   (let ((tmp_3 (first x)))
+// CHECK-NEXT:   (let ((tmp_4 (and (= (bvand tmp_3 x_zeros) tmp_1) (= (bvand tmp_3 x_ones) x_ones))))
+// CHECK-NEXT:   (let ((tmp_5 (bvand (first x) (first y))))
+// CHECK-NEXT:   (let ((tmp_6 (= (bvand tmp_5 (bvor x_zeros y_zeros)) tmp_1)))
+// CHECK-NEXT:   (and (and tmp_4 tmp_2) (not tmp_6))))))))))
+// CHECK-NEXT: (check-sat)
+
+// Z3: unsat
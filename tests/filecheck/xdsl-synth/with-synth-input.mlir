@@ -12,8 +12,7 @@ builtin.module {
 
 // CHECK: (declare-datatypes ((Pair 2)) ((par (X Y) ((pair (first X) (second Y))))))
 // CHECK-NEXT: (define-fun test ((arg0 (Pair (_ BitVec 32) Bool))) (Pair (_ BitVec 32) Bool)
-// CHECK-NEXT:   (let ((c2 (pair (_ bv2 32) false)))
-// CHECK-NEXT:   (pair (bvmul (first arg0) (first c2)) (or (second arg0) (second c2)))))
+// CHECK-NEXT:   (pair (bvmul (first arg0) (_ bv2 32)) (second arg0)))
 // CHECK-NEXT: (define-fun test_0 ((arg0_0 (Pair (_ BitVec 32) Bool)) (c (Pair (_ BitVec 32) Bool))) (Pair (_ BitVec 32) Bool)
 // CHECK-NEXT:   (let ((tmp (first c)))
 // CHECK-NEXT:   (pair (bvshl (first arg0_0) tmp) (or (bvugt tmp (_ bv32 32)) (or (second arg0_0) (second c))))))
@@ -14,13 +14,9 @@ builtin.module {
 
 // CHECK:      (declare-datatypes ((Pair 2)) ((par (X Y) ((pair (first X) (second Y))))))
 // CHECK-NEXT: (define-fun test ((arg0 (Pair (_ BitVec 32) Bool))) (Pair (_ BitVec 32) Bool)
-// CHECK-NEXT:   (let ((y (pair (_ bv4 32) false)))
-// CHECK-NEXT:   (let ((x (pair (_ bv3 32) false)))
-// CHECK-NEXT:   (let ((r1 (pair (bvadd (first arg0) (first x)) (or (second arg0) (second x)))))
-// CHECK-NEXT:   (pair (bvadd (first r1) (first y)) (or (second r1) (second y)))))))
+// CHECK-NEXT:   (pair (bvadd (bvadd (first arg0) (_ bv3 32)) (_ bv4 32)) (second arg0)))
 // CHECK-NEXT: (define-fun test_0 ((arg0_0 (Pair (_ BitVec 32) Bool))) (Pair (_ BitVec 32) Bool)
-// CHECK-NEXT:   (let ((x (pair (_ bv7 32) false)))
-// CHECK-NEXT:   (pair (bvadd (first arg0_0) (first x)) (or (second arg0_0) (second x)))))
+// CHECK-NEXT:   (pair (bvadd (first arg0_0) (_ bv7 32)) (second arg0_0)))
 // CHECK-NEXT: (assert (forall ((tmp (Pair (_ BitVec 32) Bool))) (let ((tmp_0 (test_0 tmp)))
 // CHECK-NEXT: (let ((tmp_1 (test tmp)))
 // CHECK-NEXT: (or (and (not (second tmp_0)) (= (first tmp_1) (first tmp_0))) (second tmp_1))))))
@@ -1,5 +1,7 @@
 // RUN: xdsl-tv %S/with-args-input.mlir %S/with-args-output.mlir | filecheck "%s"
 // RUN: xdsl-tv %S/with-args-input.mlir %S/with-args-output.mlir | z3 -in
+// RUN: xdsl-tv %S/with-args-input.mlir %S/with-args-output.mlir -opt | filecheck "%s" --check-prefix=OPT
+// RUN: xdsl-tv %S/with-args-input.mlir %S/with-args-output.mlir -opt | z3 -in
 
 // This file uses `with-args-output.mlir`
 
@@ -15,15 +17,25 @@ builtin.module {
 
 // CHECK:       (declare-datatypes ((Pair 2)) ((par (X Y) ((pair (first X) (second Y))))))
 // CHECK-NEXT:  (define-fun test ((arg0 (Pair (_ BitVec 32) Bool))) (Pair (_ BitVec 32) Bool)
-// CHECK-NEXT:    (let ((y (pair (_ bv4 32) false)))
-// CHECK-NEXT:    (let ((x (pair (_ bv3 32) false)))
-// CHECK-NEXT:    (let ((r1 (pair (bvadd (first arg0) (first x)) (or (second arg0) (second x)))))
-// CHECK-NEXT:    (pair (bvadd (first r1) (first y)) (or (second r1) (second y)))))))
+// CHECK-NEXT:    (pair (bvadd (bvadd (first arg0) (_ bv3 32)) (_ bv4 32)) (second arg0)))
 // CHECK-NEXT:  (define-fun test_0 ((arg0_0 (Pair (_ BitVec 32) Bool))) (Pair (_ BitVec 32) Bool)
-// CHECK-NEXT:    (let ((x (pair (_ bv7 32) false)))
-// CHECK-NEXT:    (pair (bvadd (first arg0_0) (first x)) (or (second arg0_0) (second x)))))
+// CHECK-NEXT:    (pair (bvadd (first arg0_0) (_ bv7 32)) (second arg0_0)))
 // CHECK-NEXT:  (declare-const tmp (Pair (_ BitVec 32) Bool))
 // CHECK-NEXT:  (assert (let ((tmp_0 (test tmp)))
 // CHECK-NEXT:    (let ((tmp_1 (test_0 tmp)))
 // CHECK-NEXT:    (not (or (and (not (second tmp_1)) (= (first tmp_0) (first tmp_1))) (second tmp_0))))))
 // CHECK-NEXT:  (check-sat)
+
+// OPT:       (declare-datatypes ((Pair 2)) ((par (X Y) ((pair (first X) (second Y))))))
+// OPT-NEXT:  (define-fun test_second ((tmp (_ BitVec 32)) (tmp_0 Bool)) Bool
+// OPT-NEXT:    tmp_0)
+// OPT-NEXT:  (define-fun test_first ((tmp_1 (_ BitVec 32)) (tmp_2 Bool)) (_ BitVec 32)
+// OPT-NEXT:    (bvadd (bvadd tmp_1 (_ bv3 32)) (_ bv4 32)))
+// OPT-NEXT:  (define-fun test_second_0 ((tmp_3 (_ BitVec 32)) (tmp_4 Bool)) Bool
+// OPT-NEXT:    tmp_4)
+// OPT-NEXT:  (define-fun test_first_0 ((tmp_5 (_ BitVec 32)) (tmp_6 Bool)) (_ BitVec 32)
+// OPT-NEXT:    (bvadd tmp_5 (_ bv7 32)))
+// OPT-NEXT:  (declare-const const_first (_ BitVec 32))
+// OPT-NEXT:  (declare-const const_second Bool)
+// OPT-NEXT:  (assert (not (or (and (not (test_second_0 const_first const_second)) (= (test_first const_first const_second) (test_first_0 const_first const_second))) (test_second const_first const_second))))
+// OPT-NEXT:  (check-sat)
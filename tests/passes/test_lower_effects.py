@@ -0,0 +1,29 @@
+from xdsl.dialects.builtin import DictionaryAttr, FunctionType, IntAttr
+
+from xdsl_smt.dialects.smt_bitvector_dialect import BitVectorType
+from xdsl_smt.dialects.smt_dialect import BoolType
+from xdsl_smt.dialects.smt_ub_dialect import UBStateType
+from xdsl_smt.dialects.smt_utils_dialect import PairType
+from xdsl_smt.passes.lower_effects import recursively_convert_attr
+
+
+def test_convert_nested_ub_state():
+    pair = PairType(UBStateType(), BitVectorType(32))
+    assert recursively_convert_attr(pair) == PairType(BoolType(), BitVectorType(32))
+
+
+def test_convert_unchanged_is_identity():
+    # Equal but distinct attributes should each be returned as is, even though
+    # the conversion of the first one is cached.
+    first = PairType(BitVectorType(32), BoolType())
+    second = PairType(BitVectorType(32), BoolType())
+    assert recursively_convert_attr(first) is first
+    assert recursively_convert_attr(second) is second
+
+    func = FunctionType.from_lists([second], [second])
+    assert recursively_convert_attr(func) is func
+
+
+def test_convert_unhashable():
+    attr = DictionaryAttr({"width": IntAttr(32)})
+    assert recursively_convert_attr(attr) is attr
@@ -647,22 +647,29 @@ def find_concrete_function(func_name: str, width: int, extra: int | None):
     return (result, args_width, result_width)
 
 
+def smt_lowering(width: int):
+    """Configure the SMT lowering of transfer functions for the given width."""
+    return SMTLowerer.configured(
+        rewrite_patterns={
+            **func_to_smt_patterns,
+        },
+        type_lowerers=[
+            integer_poison_type_lowerer,
+            abstract_value_type_lowerer,
+            lambda type: transfer_integer_type_lowerer(type, width),
+        ],
+        op_semantics={
+            **arith_semantics,
+            **transfer_semantics,
+            **comb_semantics,
+        },
+    )
+
+
 def lowerToSMTModule(module: ModuleOp, width: int, ctx: MLContext):
     # lower to SMT
-    SMTLowerer.rewrite_patterns = {
-        **func_to_smt_patterns,
-    }
-    SMTLowerer.type_lowerers = [
-        integer_poison_type_lowerer,
-        abstract_value_type_lowerer,
-        lambda type: transfer_integer_type_lowerer(type, width),
-    ]
-    SMTLowerer.op_semantics = {
-        **arith_semantics,
-        **transfer_semantics,
-        **comb_semantics,
-    }
-    LowerToSMTPass().apply(ctx, module)
+    with smt_lowering(width):
+        LowerToSMTPass().apply(ctx, module)
 
 
 def update_width_module(
@@ -873,7 +880,8 @@ def main() -> None:
                 )
                 query_module.body.block.add_ops(added_ops)
                 FunctionCallInline(True, {}).apply(ctx, query_module)
-                LowerToSMTPass().apply(ctx, query_module)
+                with smt_lowering(width):
+                    LowerToSMTPass().apply(ctx, query_module)
                 # print_to_smtlib(query_module, sys.stdout)
 
                 print("Soundness Check result:", verify_pattern(ctx, query_module))
@@ -30,7 +30,6 @@ from ..dialects.hoare_dialect import Hoare
 from ..dialects.pdl_dataflow import PDLDataflowDialect
 from ..dialects.smt_bitvector_dialect import SMTBitVectorDialect
 from ..dialects.smt_dialect import SMTDialect
-from ..dialects.smt_bitvector_dialect import SMTBitVectorDialect
 from ..dialects.smt_utils_dialect import SMTUtilsDialect
 from ..dialects.index_dialect import Index
 from ..dialects.transfer import TransIntegerType, Transfer
@@ -211,14 +210,6 @@ class OptMain(xDSLOptMain):
 
 
 def main() -> None:
-    SMTLowerer.rewrite_patterns = {
-        **transfer_to_smt_patterns,
-        **func_to_smt_patterns,
-    }
-    SMTLowerer.type_lowerers = [integer_poison_type_lowerer]
-    SMTLowerer.attribute_semantics = {IntegerAttr: IntegerAttrSemantics()}
-    SMTLowerer.op_semantics = {**arith_semantics, **comb_semantics}
-
     PDLToSMT.pdl_lowerer.native_rewrites = integer_arith_native_rewrites
     PDLToSMT.pdl_lowerer.native_constraints = integer_arith_native_constraints
     PDLToSMT.pdl_lowerer.native_static_constraints = (
@@ -226,7 +217,13 @@ def main() -> None:
     )
     PDLToSMT.pdl_lowerer.effect_state_types = [UBStateType()]
 
-    OptMain().run()
+    with SMTLowerer.configured(
+        rewrite_patterns={**transfer_to_smt_patterns, **func_to_smt_patterns},
+        type_lowerers=[integer_poison_type_lowerer],
+        attribute_semantics={IntegerAttr: IntegerAttrSemantics()},
+        op_semantics={**arith_semantics, **comb_semantics},
+    ):
+        OptMain().run()
 
 
 if __name__ == "__main__":
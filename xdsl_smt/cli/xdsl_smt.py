@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from xdsl.ir import Dialect
+from xdsl.ir import Dialect, Operation
 from xdsl.xdsl_opt_main import xDSLOptMain
 
 from xdsl.dialects.builtin import Builtin, IntegerAttr
@@ -10,9 +10,13 @@ from xdsl.dialects.arith import Arith
 from xdsl.dialects.comb import Comb
 from xdsl_smt.dialects.smt_ub_dialect import SMTUBDialect, UBStateType
 from xdsl_smt.passes.lower_effects import LowerEffectPass
-from xdsl_smt.passes.lower_to_smt.lower_to_smt import SMTLowerer
+from xdsl_smt.passes.lower_to_smt.lower_to_smt import (
+    SMTLowerer,
+    SMTLoweringRewritePattern,
+)
 from xdsl_smt.semantics.arith_semantics import arith_semantics
 from xdsl_smt.semantics.builtin_semantics import IntegerAttrSemantics
+from xdsl_smt.semantics.semantics import OperationSemantics
 
 from xdsl_smt.passes.lower_to_smt import (
     integer_poison_type_lowerer,
@@ -27,7 +31,6 @@ from ..dialects.hoare_dialect import Hoare
 from ..dialects.pdl_dataflow import PDLDataflowDialect
 from ..dialects.smt_bitvector_dialect import SMTBitVectorDialect
 from ..dialects.smt_dialect import SMTDialect
-from ..dialects.smt_bitvector_dialect import SMTBitVectorDialect
 from ..dialects.smt_utils_dialect import SMTUtilsDialect
 from ..dialects.index_dialect import Index
 from ..dialects.transfer import Transfer
@@ -50,27 +53,48 @@ from xdsl_smt.pdl_constraints.integer_arith_constraints import (
 )
 
 
+NEW_PDL = Dialect(
+    "pdl",
+    [*PDL.operations, *PDLDataflowDialect.operations],
+    [*PDL.attributes, *PDLDataflowDialect.attributes],
+)
+"""The PDL dialect, extended with the dataflow operations."""
+
+_ALL_DIALECTS: tuple[Dialect, ...] = (
+    Arith,
+    Builtin,
+    Func,
+    Index,
+    SMTDialect,
+    SMTBitVectorDialect,
+    SMTUtilsDialect,
+    SMTUBDialect,
+    Transfer,
+    Hoare,
+    NEW_PDL,
+    Comb,
+    HW,
+    LLVM,
+)
+"""The dialects registered in the context."""
+
+_REWRITE_PATTERNS: dict[type[Operation], SMTLoweringRewritePattern] = {
+    **func_to_smt_patterns,
+    **transfer_to_smt_patterns,
+}
+"""The lowering patterns used for operations without semantics."""
+
+_OP_SEMANTICS: dict[type[Operation], OperationSemantics] = {
+    **arith_semantics,
+    **comb_semantics,
+}
+"""The semantics of the operations lowered to SMT."""
+
+
 class OptMain(xDSLOptMain):
     def register_all_dialects(self):
-        NEW_PDL = Dialect(
-            "pdl",
-            [*PDL.operations, *PDLDataflowDialect.operations],
-            [*PDL.attributes, *PDLDataflowDialect.attributes],
-        )
-        self.ctx.register_dialect(Arith.name, lambda: Arith)
-        self.ctx.register_dialect(Builtin.name, lambda: Builtin)
-        self.ctx.register_dialect(Func.name, lambda: Func)
-        self.ctx.register_dialect(Index.name, lambda: Index)
-        self.ctx.register_dialect(SMTDialect.name, lambda: SMTDialect)
-        self.ctx.register_dialect(SMTBitVectorDialect.name, lambda: SMTBitVectorDialect)
-        self.ctx.register_dialect(SMTUtilsDialect.name, lambda: SMTUtilsDialect)
-        self.ctx.register_dialect(SMTUBDialect.name, lambda: SMTUBDialect)
-        self.ctx.register_dialect(Transfer.name, lambda: Transfer)
-        self.ctx.register_dialect(Hoare.name, lambda: Hoare)
-        self.ctx.register_dialect(PDL.name, lambda: NEW_PDL)
-        self.ctx.register_dialect(Comb.name, lambda: Comb)
-        self.ctx.register_dialect(HW.name, lambda: HW)
-        self.ctx.register_dialect(LLVM.name, lambda: LLVM)
+        for dialect in _ALL_DIALECTS:
+            self.ctx.register_dialect(dialect.name, lambda dialect=dialect: dialect)
         self.ctx.load_registered_dialect(SMTDialect.name)
         self.ctx.load_registered_dialect(SMTBitVectorDialect.name)
         self.ctx.load_registered_dialect(SMTUtilsDialect.name)
@@ -93,12 +117,6 @@ class OptMain(xDSLOptMain):
 
 def main():
     xdsl_main = OptMain()
-    SMTLowerer.type_lowerers = [integer_poison_type_lowerer]
-    SMTLowerer.attribute_semantics = {IntegerAttr: IntegerAttrSemantics()}
-    SMTLowerer.op_semantics = {**arith_semantics, **comb_semantics}
-    SMTLowerer.rewrite_patterns = {**func_to_smt_patterns, **transfer_to_smt_patterns}
-    SMTLowerer.effect_types = [UBStateType()]
-
     PDLToSMT.pdl_lowerer.native_rewrites = integer_arith_native_rewrites
     PDLToSMT.pdl_lowerer.native_constraints = integer_arith_native_constraints
     PDLToSMT.pdl_lowerer.native_static_constraints = (
@@ -106,7 +124,16 @@ def main():
     )
     PDLToSMT.pdl_lowerer.effect_state_types = [UBStateType()]
 
-    xdsl_main.run()
+    # The lowering tables are also used by the pdl-to-smt and dynamic-semantics
+    # passes, so they are set for the whole pipeline.
+    with SMTLowerer.configured(
+        type_lowerers=[integer_poison_type_lowerer],
+        attribute_semantics={IntegerAttr: IntegerAttrSemantics()},
+        op_semantics=_OP_SEMANTICS,
+        rewrite_patterns=_REWRITE_PATTERNS,
+        effect_types=[UBStateType()],
+    ):
+        xdsl_main.run()
 
 
 if __name__ == "__main__":
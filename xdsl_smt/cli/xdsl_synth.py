@@ -26,7 +26,6 @@ from ..dialects.smt_dialect import (
     SMTDialect,
     YieldOp,
 )
-from ..dialects.smt_bitvector_dialect import SMTBitVectorDialect
 from ..dialects.smt_utils_dialect import FirstOp, SMTUtilsDialect, SecondOp
 from ..dialects.hw_dialect import HW
 from ..dialects.llvm_dialect import LLVM
@@ -183,21 +182,19 @@ def main() -> None:
     assert isinstance(module, ModuleOp)
     assert isinstance(module_after, ModuleOp)
 
-    SMTLowerer.rewrite_patterns = {
-        **transfer_to_smt_patterns,
-        **func_to_smt_patterns,
-    }
-    SMTLowerer.type_lowerers = [integer_poison_type_lowerer]
-    SMTLowerer.op_semantics = {**arith_semantics, **comb_semantics}
-
     # Move smt.synth.constant to function arguments
     func_after = module_after.ops.first
     assert isinstance(func_after, FuncOp)
     move_synth_constants_to_arguments(func_after)
 
     # Convert both module to SMTLib
-    LowerToSMTPass().apply(ctx, module)
-    LowerToSMTPass().apply(ctx, module_after)
+    with SMTLowerer.configured(
+        rewrite_patterns={**transfer_to_smt_patterns, **func_to_smt_patterns},
+        type_lowerers=[integer_poison_type_lowerer],
+        op_semantics={**arith_semantics, **comb_semantics},
+    ):
+        LowerToSMTPass().apply(ctx, module)
+        LowerToSMTPass().apply(ctx, module_after)
 
     # Collect the function from both modules
     if (
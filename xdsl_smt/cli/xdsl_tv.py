@@ -2,12 +2,17 @@
 
 import argparse
 import sys
+from pathlib import Path
 
 from xdsl.context import MLContext
-from xdsl.ir import Operation, SSAValue
+from xdsl.ir import Dialect, Operation, SSAValue
 from xdsl.parser import Parser
 
-from xdsl_smt.passes.lower_to_smt.lower_to_smt import SMTLowerer
+from xdsl_smt.passes.lower_to_smt.lower_to_smt import (
+    SMTLowerer,
+    SMTLoweringRewritePattern,
+)
+from xdsl_smt.semantics.semantics import OperationSemantics
 
 from ..dialects.smt_bitvector_dialect import SMTBitVectorDialect
 from ..dialects.smt_dialect import (
@@ -22,7 +27,6 @@ from ..dialects.smt_dialect import (
     OrOp,
     SMTDialect,
 )
-from ..dialects.smt_bitvector_dialect import SMTBitVectorDialect
 from ..dialects.smt_utils_dialect import FirstOp, SMTUtilsDialect, SecondOp
 from ..dialects.hw_dialect import HW
 from ..dialects.llvm_dialect import LLVM
@@ -42,6 +46,41 @@ from xdsl_smt.semantics.arith_semantics import arith_semantics
 from xdsl_smt.semantics.comb_semantics import comb_semantics
 from ..traits.smt_printer import print_to_smtlib
 
+_ALL_DIALECTS: tuple[Dialect, ...] = (
+    Arith,
+    Builtin,
+    Func,
+    SMTDialect,
+    SMTBitVectorDialect,
+    SMTUtilsDialect,
+    Comb,
+    HW,
+    LLVM,
+)
+"""The dialects loaded in the context."""
+
+_REWRITE_PATTERNS: dict[type[Operation], SMTLoweringRewritePattern] = {
+    # *transfer_to_smt_patterns,
+    **func_to_smt_patterns,
+    # *llvm_to_smt_patterns,
+}
+"""The lowering patterns used for operations without semantics."""
+
+_OP_SEMANTICS: dict[type[Operation], OperationSemantics] = {
+    **arith_semantics,
+    **comb_semantics,
+}
+"""The semantics of the operations lowered to SMT."""
+
+
+MAX_OPT_ITERATIONS = 16
+"""Maximum number of iterations of the `-opt` passes."""
+
+
+def count_ops(op: Operation) -> int:
+    """Count the operations nested in an operation, including itself."""
+    return sum(1 for _ in op.walk())
+
 
 def register_all_arguments(arg_parser: argparse.ArgumentParser):
     arg_parser.add_argument(
@@ -66,40 +105,47 @@ def function_refinement(func: DefineFunOp, func_after: DefineFunOp) -> list[Oper
     An assert check is added to the end of the list of operations.
     """
     args: list[SSAValue] = []
-    ops = list[Operation]()
+    arg_ops: list[Operation] = []
 
     for arg in func.body.blocks[0].args:
         const_op = DeclareConstOp(arg.type)
-        ops.append(const_op)
+        arg_ops.append(const_op)
         args.append(const_op.res)
 
     # Call both operations
     func_call = CallOp.get(func.results[0], args)
     func_call_after = CallOp.get(func_after.results[0], args)
-    ops += [func_call, func_call_after]
 
     # Get the function return values and poison
     ret_value = FirstOp(func_call.res)
     ret_poison = SecondOp(func_call.res)
-    ops.extend((ret_value, ret_poison))
 
     ret_value_after = FirstOp(func_call_after.res)
     ret_poison_after = SecondOp(func_call_after.res)
-    ops.extend((ret_value_after, ret_poison_after))
 
     not_after_poison = NotOp.get(ret_poison_after.res)
     value_eq = EqOp.get(ret_value.res, ret_value_after.res)
     value_refinement = AndOp.get(not_after_poison.res, value_eq.res)
     refinement = OrOp.get(value_refinement.res, ret_poison.res)
-    ops.extend([not_after_poison, value_eq, value_refinement, refinement])
 
     not_refinement = NotOp.get(refinement.res)
-    ops.append(not_refinement)
-
     assert_op = AssertOp(not_refinement.res)
-    ops.append(assert_op)
 
-    return ops
+    return [
+        *arg_ops,
+        func_call,
+        func_call_after,
+        ret_value,
+        ret_poison,
+        ret_value_after,
+        ret_poison_after,
+        not_after_poison,
+        value_eq,
+        value_refinement,
+        refinement,
+        not_refinement,
+        assert_op,
+    ]
 
 
 def main() -> None:
@@ -109,24 +155,19 @@ def main() -> None:
     args = arg_parser.parse_args()
 
     # Register all dialects
-    ctx.load_dialect(Arith)
-    ctx.load_dialect(Builtin)
-    ctx.load_dialect(Func)
-    ctx.load_dialect(SMTDialect)
-    ctx.load_dialect(SMTBitVectorDialect)
-    ctx.load_dialect(SMTUtilsDialect)
-    ctx.load_dialect(Comb)
-    ctx.load_dialect(HW)
-    ctx.load_dialect(LLVM)
+    for dialect in _ALL_DIALECTS:
+        ctx.load_dialect(dialect)
 
     # Parse the files
     def parse_file(file: str | None) -> Operation:
+        # The parser needs the whole input as a string, so each input is read
+        # and decoded in a single call.
         if file is None:
-            f = sys.stdin
+            text = sys.stdin.buffer.read().decode("utf-8")
         else:
-            f = open(file)
+            text = Path(file).read_text(encoding="utf-8")
 
-        parser = Parser(ctx, f.read())
+        parser = Parser(ctx, text)
         module = parser.parse_module()
         return module
 
@@ -136,17 +177,14 @@ def main() -> None:
     assert isinstance(module, ModuleOp)
     assert isinstance(module_after, ModuleOp)
 
-    SMTLowerer.rewrite_patterns = {
-        # *transfer_to_smt_patterns,
-        **func_to_smt_patterns,
-        # *llvm_to_smt_patterns,
-    }
-    SMTLowerer.type_lowerers = [integer_poison_type_lowerer]
-    SMTLowerer.op_semantics = {**arith_semantics, **comb_semantics}
-
     # Convert both module to SMTLib
-    LowerToSMTPass().apply(ctx, module)
-    LowerToSMTPass().apply(ctx, module_after)
+    with SMTLowerer.configured(
+        rewrite_patterns=_REWRITE_PATTERNS,
+        op_semantics=_OP_SEMANTICS,
+        type_lowerers=[integer_poison_type_lowerer],
+    ):
+        LowerToSMTPass().apply(ctx, module)
+        LowerToSMTPass().apply(ctx, module_after)
 
     # Collect the function from both modules
     if (
@@ -173,8 +211,17 @@ def main() -> None:
     block.add_op(CheckSatOp())
 
     if args.opt:
-        LowerPairs().apply(ctx, new_module)
-        CanonicalizeSMT().apply(ctx, new_module)
+        # Lowering pairs exposes new canonicalization opportunities, and
+        # canonicalizing can expose new pairs to lower, so iterate both passes
+        # until the number of operations stops decreasing.
+        num_ops = count_ops(new_module)
+        for _ in range(MAX_OPT_ITERATIONS):
+            LowerPairs().apply(ctx, new_module)
+            CanonicalizeSMT().apply(ctx, new_module)
+            new_num_ops = count_ops(new_module)
+            if new_num_ops >= num_ops:
+                break
+            num_ops = new_num_ops
     print_to_smtlib(new_module, sys.stdout)
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import TypeVar, IO, overload
 
 from xdsl.dialects.builtin import IntAttr, IntegerAttr, IntegerType
@@ -7,6 +8,7 @@ from xdsl.dialects.builtin import IntAttr, IntegerAttr, IntegerType
 from xdsl.ir import (
     Attribute,
     Dialect,
+    Operation,
     OpResult,
     ParametrizedAttribute,
     SSAValue,
@@ -31,22 +33,58 @@ from ..traits.effects import Pure
 from .smt_dialect import BoolType
 
 
+_INT_ATTR_CACHE: dict[int, IntAttr] = {}
+"""Canonical `IntAttr` instances used for bitvector widths."""
+
+
+def _int_attr(value: int) -> IntAttr:
+    """Get the canonical `IntAttr` for a bitvector width."""
+    attr = _INT_ATTR_CACHE.get(value)
+    if attr is None:
+        attr = IntAttr(value)
+        _INT_ATTR_CACHE[value] = attr
+    return attr
+
+
+@lru_cache(maxsize=None)
+def _bv_type(width: int) -> BitVectorType:
+    return BitVectorType(width)
+
+
+@lru_cache(maxsize=4096)
+def _bv_value(value: int, width: int) -> BitVectorValue:
+    return BitVectorValue(value, width)
+
+
+@lru_cache(maxsize=None)
+def _bv_sort_str(width: int) -> str:
+    """Get the SMTLib sort of a bitvector of the given width."""
+    return f"(_ BitVec {width})"
+
+
+@lru_cache(maxsize=4096)
+def _bv_value_str(value: int, width: int) -> str:
+    """Get the SMTLib literal of a bitvector value."""
+    return f"(_ bv{value} {width})"
+
+
 @irdl_attr_definition
 class BitVectorType(ParametrizedAttribute, SMTLibSort, TypeAttribute):
     name = "smt.bv.bv"
     width: ParameterDef[IntAttr]
 
     def print_sort_to_smtlib(self, stream: IO[str]):
-        print(f"(_ BitVec {self.width.data})", file=stream, end="")
+        stream.write(_bv_sort_str(self.width.data))
 
     def __init__(self, value: int | IntAttr):
         if isinstance(value, int):
-            value = IntAttr(value)
+            value = _int_attr(value)
         super().__init__([value])
 
     @staticmethod
     def from_int(value: int) -> BitVectorType:
-        return BitVectorType(value)
+        """Get the interned bitvector type of the given width."""
+        return _bv_type(value)
 
     @classmethod
     def parse_parameters(cls, parser: AttrParser) -> list[Attribute]:
@@ -70,12 +108,13 @@ class BitVectorValue(ParametrizedAttribute):
         if isinstance(value, int):
             value = IntAttr(value)
         if isinstance(width, int):
-            width = IntAttr(width)
+            width = _int_attr(width)
         super().__init__([value, width])
 
     @staticmethod
     def from_int_value(value: int, width: int = 32) -> BitVectorValue:
-        return BitVectorValue(value, width)
+        """Get the interned bitvector value of the given width."""
+        return _bv_value(value, width)
 
     def get_type(self) -> BitVectorType:
         return BitVectorType.from_int(self.width.data)
@@ -85,7 +124,7 @@ class BitVectorValue(ParametrizedAttribute):
             raise VerifyException("BitVector value out of range")
 
     def as_smtlib_str(self) -> str:
-        return f"(_ bv{self.value.data} {self.width.data})"
+        return _bv_value_str(self.value.data, self.width.data)
 
     @classmethod
     def parse_parameters(cls, parser: AttrParser) -> list[Attribute]:
@@ -120,10 +159,16 @@ class ConstantOp(IRDLOperation, Pure, SMTLibOp):
         width: int | IntAttr | None = None,
     ) -> None:
         attr: BitVectorValue
-        if isinstance(value, int | IntAttr):
-            if not isinstance(width, int | IntAttr):
+        # This constructor is on the hot path of all lowerings, so we avoid
+        # `isinstance` checks against union types, which are slow.
+        if isinstance(value, int) or isinstance(value, IntAttr):
+            if isinstance(width, IntAttr):
+                width = width.data
+            elif not isinstance(width, int):
                 raise ValueError("Expected width with an `int` value")
-            attr = BitVectorValue(value, width)
+            if isinstance(value, IntAttr):
+                value = value.data
+            attr = BitVectorValue.from_int_value(value, width)
         elif isinstance(value, BitVectorValue):
             attr = value
         else:
@@ -133,7 +178,7 @@ class ConstantOp(IRDLOperation, Pure, SMTLibOp):
                 if value.value.data < 0
                 else value.value.data
             )
-            attr = BitVectorValue(value, width)
+            attr = BitVectorValue.from_int_value(value, width)
         super().__init__(result_types=[attr.get_type()], attributes={"value": attr})
 
     @staticmethod
@@ -144,7 +189,7 @@ class ConstantOp(IRDLOperation, Pure, SMTLibOp):
         )
 
     def print_expr_to_smtlib(self, stream: IO[str], ctx: SMTConversionCtx) -> None:
-        print(self.value.as_smtlib_str(), file=stream, end="")
+        stream.write(self.value.as_smtlib_str())
 
 
 _UOpT = TypeVar("_UOpT", bound="UnaryBVOp")
@@ -155,7 +200,9 @@ class UnaryBVOp(IRDLOperation, Pure):
     arg: Operand = operand_def(BitVectorType)
 
     def __init__(self, arg: SSAValue):
-        super().__init__(result_types=[arg.type], operands=[arg])
+        # The operand and result layout is fixed, so we skip the generic IRDL
+        # initialization, which is costly as these operations are created often.
+        Operation.__init__(self, operands=(arg,), result_types=(arg.type,))
 
     @classmethod
     def get(cls: type[_UOpT], arg: SSAValue) -> _UOpT:
@@ -174,10 +221,8 @@ class BinaryBVOp(IRDLOperation, Pure):
     lhs: Operand = operand_def(BitVectorType)
     rhs: Operand = operand_def(BitVectorType)
 
-    def __init__(self, lhs: Operand, rhs: Operand, res: Attribute | None = None):
-        if res is None:
-            res = lhs.type
-        super().__init__(result_types=[lhs.type], operands=[lhs, rhs])
+    def __init__(self, lhs: Operand, rhs: Operand):
+        Operation.__init__(self, operands=(lhs, rhs), result_types=(lhs.type,))
 
     @classmethod
     def get(cls: type[_BOpT], lhs: SSAValue, rhs: SSAValue) -> _BOpT:
@@ -363,7 +408,7 @@ class BinaryPredBVOp(IRDLOperation, Pure):
     rhs: Operand = operand_def(BitVectorType)
 
     def __init__(self, lhs: SSAValue, rhs: SSAValue):
-        super().__init__(result_types=[BoolType()], operands=[lhs, rhs])
+        Operation.__init__(self, operands=(lhs, rhs), result_types=(BoolType(),))
 
     @classmethod
     def get(cls: type[_BPOpT], lhs: SSAValue, rhs: SSAValue) -> _BPOpT:
@@ -479,7 +524,9 @@ class ConcatOp(IRDLOperation, SimpleSMTLibOp):
         assert isinstance(lhs.type, BitVectorType)
         assert isinstance(rhs.type, BitVectorType)
         width = lhs.type.width.data + rhs.type.width.data
-        super().__init__(result_types=[BitVectorType(width)], operands=[lhs, rhs])
+        super().__init__(
+            result_types=[BitVectorType.from_int(width)], operands=[lhs, rhs]
+        )
 
     def op_name(self) -> str:
         return "concat"
@@ -497,7 +544,7 @@ class ExtractOp(IRDLOperation, SMTLibOp):
 
     def __init__(self, operand: SSAValue, end: int, start: int):
         super().__init__(
-            result_types=[BitVectorType(end - start + 1)],
+            result_types=[BitVectorType.from_int(end - start + 1)],
             operands=[operand],
             attributes={"start": IntAttr(start), "end": IntAttr(end)},
         )
@@ -522,7 +569,7 @@ class RepeatOp(IRDLOperation, SMTLibOp):
         assert isinstance(operand.type, BitVectorType)
         assert count >= 1
         super().__init__(
-            result_types=[BitVectorType(operand.type.width.data * count)],
+            result_types=[BitVectorType.from_int(operand.type.width.data * count)],
             operands=[operand],
             attributes={"count": IntAttr(count)},
         )
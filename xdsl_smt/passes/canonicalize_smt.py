@@ -18,8 +18,8 @@ from xdsl.pattern_rewriter import (
 )
 from ..dialects import smt_dialect as smt
 from ..dialects import smt_utils_dialect as smt_utils
-import xdsl_smt.dialects.smt_bitvector_dialect as smt_bv
 
+from ..utils.rewrite_tools import get_bv_constant
 from .dead_code_elimination import DeadCodeElimination
 
 
@@ -32,14 +32,6 @@ class FoldCorePattern(RewritePattern):
             return None
         return constant.value.data
 
-    @staticmethod
-    def get_bv_constant(value: SSAValue) -> int | None:
-        if not isinstance(value, OpResult):
-            return None
-        if not isinstance((constant := value.op), smt_bv.ConstantOp):
-            return None
-        return constant.value.value.data
-
     def match_and_rewrite(self, op: Operation, rewriter: PatternRewriter):
         # forall x. True -> True
         # forall x. False -> False
@@ -175,8 +167,8 @@ class FoldCorePattern(RewritePattern):
             if op.lhs == op.rhs:
                 rewriter.replace_matched_op(smt.ConstantBoolOp.from_bool(True))
                 return
-            if (value := self.get_bv_constant(op.lhs)) is not None:
-                if (value2 := self.get_bv_constant(op.rhs)) is not None:
+            if (value := get_bv_constant(op.lhs)) is not None:
+                if (value2 := get_bv_constant(op.rhs)) is not None:
                     rewriter.replace_matched_op(
                         smt.ConstantBoolOp.from_bool(value == value2)
                     )
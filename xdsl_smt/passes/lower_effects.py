@@ -1,17 +1,14 @@
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
 from xdsl.ir import Operation, Attribute, ParametrizedAttribute
 from xdsl.utils.isattr import isattr
 from xdsl.passes import ModulePass
 from xdsl.context import MLContext
-from xdsl.pattern_rewriter import (
-    PatternRewriter,
-    RewritePattern,
-    op_type_rewrite_pattern,
-    GreedyRewritePatternApplier,
-    PatternRewriteWalker,
-)
+from xdsl.rewriter import Rewriter
 
-from xdsl.dialects.builtin import ModuleOp, AnyArrayAttr
+from xdsl.dialects.builtin import IntegerType, ModuleOp, AnyArrayAttr
+from xdsl_smt.dialects.smt_bitvector_dialect import BitVectorType
 from xdsl_smt.dialects.smt_dialect import BoolType, ConstantBoolOp
 from xdsl_smt.dialects.smt_ub_dialect import (
     ToBoolOp,
@@ -20,58 +17,100 @@ from xdsl_smt.dialects.smt_ub_dialect import (
 )
 
 
+new_ub_state_type = BoolType()
+"""The type of UB states once lowered."""
+
+
+_FAST_DISPATCH: dict[type[Attribute], Callable[[Attribute], Attribute]] = {
+    UBStateType: lambda attr: new_ub_state_type,
+    BoolType: lambda attr: attr,
+    BitVectorType: lambda attr: attr,
+    IntegerType: lambda attr: attr,
+}
+"""
+Conversions of the most common attribute types, dispatched on their exact type.
+Types that cannot contain effect states are returned as is.
+"""
+
+
 def recursively_convert_attr(attr: Attribute) -> Attribute:
+    """
+    Convert all effect states referenced by an attribute. Results are cached,
+    as the same attributes are usually converted many times.
+    """
+    if (convert := _FAST_DISPATCH.get(type(attr))) is not None:
+        return convert(attr)
+    try:
+        new_attr = _cached_convert_attr(attr)
+    except TypeError:
+        # Some attributes, such as dictionaries, are not hashable.
+        return _convert_attr(attr)
+    # The cache is keyed by equality, so it only records whether the attribute
+    # changed, and unchanged attributes are returned as is.
+    return attr if new_attr is None else new_attr
+
+
+@lru_cache(maxsize=None)
+def _cached_convert_attr(attr: Attribute) -> Attribute | None:
+    """Convert an attribute, returning None if it does not need to change."""
+    new_attr = _convert_attr(attr)
+    return None if new_attr is attr else new_attr
+
+
+def _convert_attr(attr: Attribute) -> Attribute:
+    # Attributes are only rebuilt if one of their children changed, so that
+    # attributes without effect states are returned as is.
     if isinstance(attr, UBStateType):
-        return BoolType()
+        return new_ub_state_type
     if isinstance(attr, ParametrizedAttribute):
-        return type(attr).new(
-            [recursively_convert_attr(param) for param in attr.parameters]
-        )
+        params = [recursively_convert_attr(param) for param in attr.parameters]
+        if all(new is old for new, old in zip(params, attr.parameters)):
+            return attr
+        return type(attr).new(params)
     if isattr(attr, AnyArrayAttr):
-        return AnyArrayAttr((recursively_convert_attr(value) for value in attr.data))
+        values = [recursively_convert_attr(value) for value in attr.data]
+        if all(new is old for new, old in zip(values, attr.data)):
+            return attr
+        return AnyArrayAttr(values)
     return attr
 
 
-class LowerGenericOp(RewritePattern):
+def lower_generic_op(op: Operation):
     """
     Recursively lower all result types, attributes, and properties that reference
     effect states.
+    As this only changes types and attributes, it is applied once on each
+    operation, rather than as a pattern that is revisited whenever a value type
+    changes.
     """
+    # `recursively_convert_attr` returns its argument when nothing needs to be
+    # converted, so an identity check is enough to detect changes.
+    for result in op.results:
+        if (new_type := recursively_convert_attr(result.type)) is not result.type:
+            result.type = new_type
 
-    def match_and_rewrite(self, op: Operation, rewriter: PatternRewriter):
-        for result in op.results:
-            if (new_type := recursively_convert_attr(result.type)) != result.type:
-                rewriter.modify_value_type(result, new_type)
-
+    if op.regions:
         for region in op.regions:
             for block in region.blocks:
                 for arg in block.args:
-                    if (new_type := recursively_convert_attr(arg.type)) != arg.type:
-                        rewriter.modify_value_type(arg, new_type)
+                    new_type = recursively_convert_attr(arg.type)
+                    if new_type is not arg.type:
+                        arg.type = new_type
 
-        has_done_action = False
-        for name, attr in op.attributes.items():
-            if (new_attr := recursively_convert_attr(attr)) != attr:
-                op.attributes[name] = new_attr
-                has_done_action = True
-        for name, attr in op.properties.items():
-            if (new_attr := recursively_convert_attr(attr)) != attr:
-                op.properties[name] = new_attr
-                has_done_action = True
-        if has_done_action:
-            rewriter.handle_operation_modification(op)
+    for name, attr in op.attributes.items():
+        if (new_attr := recursively_convert_attr(attr)) is not attr:
+            op.attributes[name] = new_attr
+    for name, attr in op.properties.items():
+        if (new_attr := recursively_convert_attr(attr)) is not attr:
+            op.properties[name] = new_attr
 
 
-class LowerTriggerOp(RewritePattern):
-    @op_type_rewrite_pattern
-    def match_and_rewrite(self, op: TriggerOp, rewriter: PatternRewriter):
-        rewriter.replace_matched_op(ConstantBoolOp(True))
+def lower_trigger_op(op: TriggerOp):
+    Rewriter.replace_op(op, ConstantBoolOp(True))
 
 
-class LowerToBoolOp(RewritePattern):
-    @op_type_rewrite_pattern
-    def match_and_rewrite(self, op: ToBoolOp, rewriter: PatternRewriter):
-        rewriter.replace_matched_op([], new_results=[op.state])
+def lower_to_bool_op(op: ToBoolOp):
+    Rewriter.replace_op(op, [], new_results=[op.state])
 
 
 @dataclass(frozen=True)
@@ -79,9 +118,18 @@ class LowerEffectPass(ModulePass):
     name = "lower-effects"
 
     def apply(self, ctx: MLContext, op: ModuleOp) -> None:
-        walker = PatternRewriteWalker(
-            GreedyRewritePatternApplier(
-                [LowerTriggerOp(), LowerToBoolOp(), LowerGenericOp()]
-            )
-        )
-        walker.rewrite_module(op)
+        _cached_convert_attr.cache_clear()
+        try:
+            # None of the lowerings create operations that need to be lowered
+            # again, so a single walk over the module is enough. Values are always
+            # lowered before their uses, as definitions are walked before their uses.
+            for sub_op in list(op.walk()):
+                if isinstance(sub_op, TriggerOp):
+                    lower_trigger_op(sub_op)
+                elif isinstance(sub_op, ToBoolOp):
+                    lower_to_bool_op(sub_op)
+                else:
+                    lower_generic_op(sub_op)
+        finally:
+            # Do not keep the attributes of the module alive after the pass.
+            _cached_convert_attr.cache_clear()
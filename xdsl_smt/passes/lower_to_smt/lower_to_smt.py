@@ -7,13 +7,15 @@ handle more dialects.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from dataclasses import dataclass
 from functools import reduce
-from typing import Callable, ClassVar
+from typing import Callable, ClassVar, Iterator, Sequence
 
 from xdsl.passes import ModulePass
 from xdsl.ir import Attribute, Operation, SSAValue, Region
 from xdsl.traits import IsTerminator
+from xdsl.rewriter import Rewriter
 from xdsl.context import MLContext
 from xdsl.dialects.builtin import IntegerType, ModuleOp
 from xdsl.pattern_rewriter import (
@@ -23,6 +25,7 @@ from xdsl.pattern_rewriter import (
 
 from xdsl_smt.dialects import smt_dialect
 from xdsl_smt.dialects.smt_dialect import BoolType
+from xdsl_smt.traits.effects import Pure
 from xdsl_smt.semantics.pdl_semantics import PDLSemantics
 from xdsl_smt.semantics.semantics import (
     AttributeSemantics,
@@ -39,14 +42,14 @@ from xdsl.dialects import pdl
 def integer_poison_type_lowerer(type: Attribute) -> Attribute | None:
     """Convert an integer type to a bitvector integer with a poison flag."""
     if isinstance(type, IntegerType):
-        return PairType(BitVectorType(type.width), BoolType())
+        return PairType(BitVectorType.from_int(type.width.data), BoolType())
     return None
 
 
 def integer_type_lowerer(type: Attribute) -> Attribute | None:
     """Convert an integer type to a bitvector integer."""
     if isinstance(type, IntegerType):
-        return BitVectorType(type.width)
+        return BitVectorType.from_int(type.width.data)
     return None
 
 
@@ -86,6 +89,49 @@ class SMTLowerer:
     effect_types: ClassVar[list[Attribute]] = []
     dynamic_semantics_enabled: ClassVar[bool] = False
 
+    _lowered_types: ClassVar[dict[Attribute, Attribute]] = {}
+    """Cache of already lowered types, valid for `_lowered_types_lowerers`."""
+    _lowered_types_lowerers: ClassVar[
+        list[Callable[[Attribute], Attribute | None]]
+    ] = []
+    """A copy of the type lowerers that `_lowered_types` was computed with."""
+
+    @staticmethod
+    @contextmanager
+    def configured(
+        *,
+        rewrite_patterns: dict[type[Operation], SMTLoweringRewritePattern]
+        | None = None,
+        op_semantics: dict[type[Operation], OperationSemantics] | None = None,
+        type_lowerers: list[Callable[[Attribute], Attribute | None]] | None = None,
+        attribute_semantics: dict[type[Attribute], AttributeSemantics] | None = None,
+        effect_types: list[Attribute] | None = None,
+    ) -> Iterator[None]:
+        """
+        Override the given lowering tables in a `with` block, and restore the
+        previous ones when leaving it.
+        Tables that are not given are left unchanged.
+        """
+        overrides = {
+            name: value
+            for name, value in (
+                ("rewrite_patterns", rewrite_patterns),
+                ("op_semantics", op_semantics),
+                ("type_lowerers", type_lowerers),
+                ("attribute_semantics", attribute_semantics),
+                ("effect_types", effect_types),
+            )
+            if value is not None
+        }
+        previous = {name: getattr(SMTLowerer, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(SMTLowerer, name, value)
+        try:
+            yield
+        finally:
+            for name, value in previous.items():
+                setattr(SMTLowerer, name, value)
+
     @staticmethod
     def lower_region(
         region: Region, effect_states: EffectStates
@@ -108,13 +154,34 @@ class SMTLowerer:
             if isinstance(op, pdl.PatternOp) and SMTLowerer.dynamic_semantics_enabled:
                 pass
             else:
+                operands = tuple(op.operands)
                 effect_states = SMTLowerer.lower_operation(op, effect_states)
+                SMTLowerer.erase_unused_operand_ops(operands)
 
         # Terminators are not lowered yet, they are all considered to be yields.
         if (terminator := region.block.last_op) and terminator.has_trait(IsTerminator):
             return (tuple(terminator.operands), effect_states)
         return ((), effect_states)
 
+    @staticmethod
+    def erase_unused_operand_ops(operands: Sequence[SSAValue]) -> None:
+        """
+        Erase the pure operations defining `operands` that were left without uses,
+        such as integer pairs whose elements are used directly by the lowering.
+        """
+        worklist = [operand.owner for operand in operands]
+        while worklist:
+            op = worklist.pop()
+            if (
+                not isinstance(op, Operation)
+                or not isinstance(op, Pure)
+                or op.parent is None
+                or any(result.uses for result in op.results)
+            ):
+                continue
+            worklist.extend(operand.owner for operand in op.operands)
+            Rewriter.erase_op(op)
+
     @staticmethod
     def lower_operation(op: Operation, effect_states: EffectStates) -> EffectStates:
         if type(op) in SMTLowerer.rewrite_patterns:
@@ -150,8 +217,19 @@ class SMTLowerer:
         # Do not lower effect states to SMT, these are done in separate passes.
         if isinstance(type, EffectState):
             return type
+
+        # The cache is only valid for the type lowerers it was computed with.
+        # These are compared by value, so that both replacing the list and
+        # modifying it in place invalidate the cache.
+        if SMTLowerer._lowered_types_lowerers != SMTLowerer.type_lowerers:
+            SMTLowerer._lowered_types = {}
+            SMTLowerer._lowered_types_lowerers = list(SMTLowerer.type_lowerers)
+        if (res := SMTLowerer._lowered_types.get(type)) is not None:
+            return res
+
         for lowerer in SMTLowerer.type_lowerers:
             if res := lowerer(type):
+                SMTLowerer._lowered_types[type] = res
                 return res
         raise ValueError(f"Cannot lower {type} to SMT")
 
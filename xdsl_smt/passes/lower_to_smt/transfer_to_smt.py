@@ -46,7 +46,7 @@ def transfer_integer_type_lowerer(
     type: Attribute, width: int
 ) -> smt_bv.BitVectorType | None:
     if isinstance(type, transfer.TransIntegerType):
-        return smt_bv.BitVectorType(width)
+        return smt_bv.BitVectorType.from_int(width)
     return None
 
 
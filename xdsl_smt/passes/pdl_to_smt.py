@@ -16,6 +16,7 @@ from xdsl.dialects.pdl import (
 from xdsl.utils.hints import isa
 from xdsl.rewriter import InsertPoint, Rewriter
 
+from xdsl_smt.semantics.arith_semantics import get_int_value_and_poison
 from xdsl_smt.semantics.refinements import IntegerTypeRefinementSemantics
 from xdsl_smt.semantics.semantics import EffectStates, RefinementSemantics
 
@@ -23,11 +24,10 @@ from ..dialects import pdl_dataflow as pdl_dataflow
 from ..dialects import smt_bitvector_dialect as smt_bv
 from ..dialects import smt_utils_dialect as smt_utils
 
-from xdsl.ir import Attribute, ErasedSSAValue, Operation, SSAValue
+from xdsl.ir import Attribute, Block, ErasedSSAValue, Operation, SSAValue
 from xdsl.context import MLContext
 
 from xdsl.pattern_rewriter import (
-    GreedyRewritePatternApplier,
     PatternRewriteWalker,
     PatternRewriter,
     RewritePattern,
@@ -45,7 +45,7 @@ from ..dialects.smt_dialect import (
     NotOp,
     OrOp,
 )
-from xdsl_smt.passes.lower_to_smt import SMTLowerer, LowerToSMTPass
+from xdsl_smt.passes.lower_to_smt import SMTLowerer
 
 
 class StaticallyUnmatchedConstraintError(Exception):
@@ -60,13 +60,137 @@ class StaticallyUnmatchedConstraintError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class PDLToSMTRewriteContext:
     pdl_types_to_types: dict[SSAValue, Attribute] = field(default_factory=dict)
     pdl_op_to_values: dict[SSAValue, Sequence[SSAValue]] = field(default_factory=dict)
     preconditions: list[SSAValue] = field(default_factory=list)
     matching_effect_states: EffectStates = EffectStates({})
     rewriting_effect_states: EffectStates = EffectStates({})
+    preconditions_and: SSAValue | None = None
+    """The conjunction of the first `preconditions_and_count` preconditions."""
+    preconditions_and_count: int = 0
+    constants_block: Block | None = None
+    """The block at the start of which shared constants are inserted."""
+    bv_zeros: dict[int, SSAValue] = field(default_factory=dict)
+    """The shared bitvector zero constants, indexed by their width."""
+
+    def get_bv_zero(self, width: int) -> SSAValue:
+        """
+        Get a bitvector zero constant of the given width. The constant is created
+        once per width at the start of `constants_block`, and is then reused.
+        """
+        if (zero := self.bv_zeros.get(width)) is not None:
+            return zero
+        assert self.constants_block is not None
+        zero_op = smt_bv.ConstantOp(0, width)
+        Rewriter.insert_op(zero_op, InsertPoint.at_start(self.constants_block))
+        self.bv_zeros[width] = zero_op.res
+        return zero_op.res
+
+
+def _get_bool_constant(value: SSAValue) -> bool | None:
+    """Get the value of a boolean constant, or None if it is not a constant."""
+    if isinstance(value.owner, ConstantBoolOp):
+        return value.owner.value.data
+    return None
+
+
+def _is_negation_of(lhs: SSAValue, rhs: SSAValue) -> bool:
+    """Check if `lhs` is syntactically the negation of `rhs`."""
+    return isinstance(lhs.owner, NotOp) and lhs.owner.arg is rhs
+
+
+def _smt_not(value: SSAValue, rewriter: PatternRewriter) -> SSAValue:
+    """
+    Get the negation of a boolean value, inserting the necessary operations
+    before the matched operation. Double negations and constants are folded.
+    """
+    if isinstance(value.owner, NotOp):
+        return value.owner.arg
+    if (constant := _get_bool_constant(value)) is not None:
+        op = ConstantBoolOp(not constant)
+    else:
+        op = NotOp(value)
+    rewriter.insert_op_before_matched_op(op)
+    return op.res
+
+
+def _smt_and(lhs: SSAValue, rhs: SSAValue, rewriter: PatternRewriter) -> SSAValue:
+    """
+    Get the conjunction of two boolean values, inserting the necessary operations
+    before the matched operation. Trivial conjunctions are folded.
+    """
+    lhs_constant = _get_bool_constant(lhs)
+    rhs_constant = _get_bool_constant(rhs)
+    if lhs_constant is True or rhs_constant is False or lhs is rhs:
+        return rhs
+    if rhs_constant is True or lhs_constant is False:
+        return lhs
+    if _is_negation_of(lhs, rhs) or _is_negation_of(rhs, lhs):
+        op = ConstantBoolOp(False)
+    else:
+        op = AndOp(lhs, rhs)
+    rewriter.insert_op_before_matched_op(op)
+    return op.res
+
+
+def _reduce_and(values: Sequence[SSAValue], rewriter: PatternRewriter) -> SSAValue:
+    """
+    Get the conjunction of a list of boolean values, inserting the necessary
+    operations before the matched operation. The values are reduced as a
+    balanced tree, and an empty list is reduced to `true`.
+    """
+    if len(values) == 0:
+        true_op = ConstantBoolOp(True)
+        rewriter.insert_op_before_matched_op(true_op)
+        return true_op.res
+    if len(values) == 1:
+        return values[0]
+    if len(values) == 2:
+        return _smt_and(values[0], values[1], rewriter)
+
+    values = list(values)
+    while len(values) > 1:
+        next_values: list[SSAValue] = []
+        for lhs, rhs in zip(values[::2], values[1::2]):
+            next_values.append(_smt_and(lhs, rhs, rewriter))
+        if len(values) % 2 == 1:
+            next_values.append(values[-1])
+        values = next_values
+    return values[0]
+
+
+def get_and_preconditions(
+    rewrite_context: PDLToSMTRewriteContext, rewriter: PatternRewriter
+) -> SSAValue | None:
+    """
+    Get the conjunction of all preconditions, or None if there are none or if
+    they are trivially true. The conjunction is built incrementally: the
+    preconditions added since the last call are reduced as a balanced tree, and
+    then conjoined with the previously computed conjunction. Each precondition is
+    thus only used once.
+    """
+    new_preconditions = rewrite_context.preconditions[
+        rewrite_context.preconditions_and_count :
+    ]
+    if not new_preconditions:
+        return rewrite_context.preconditions_and
+
+    and_preconditions: SSAValue | None = _reduce_and(new_preconditions, rewriter)
+
+    if rewrite_context.preconditions_and is not None:
+        and_preconditions = _smt_and(
+            rewrite_context.preconditions_and, and_preconditions, rewriter
+        )
+
+    # A constant true conjunction does not need to be asserted.
+    if _get_bool_constant(and_preconditions) is True:
+        and_preconditions = None
+
+    rewrite_context.preconditions_and = and_preconditions
+    rewrite_context.preconditions_and_count = len(rewrite_context.preconditions)
+    return and_preconditions
 
 
 def _get_type_of_erased_type_value(value: SSAValue) -> Attribute:
@@ -138,7 +262,9 @@ class AttributeRewrite(RewritePattern):
                 raise Exception(
                     "Cannot handle quantification of attributes with non-integer types"
                 )
-            declare_op = DeclareConstOp(smt_bv.BitVectorType(value_type.width.data))
+            declare_op = DeclareConstOp(
+                smt_bv.BitVectorType.from_int(value_type.width.data)
+            )
             rewriter.replace_matched_op(declare_op)
             return
 
@@ -159,13 +285,27 @@ class OperandRewrite(RewritePattern):
 class OperationRewrite(RewritePattern):
     ctx: MLContext
     rewrite_context: PDLToSMTRewriteContext
+    op_defs: dict[str, type[Operation]] = field(default_factory=dict)
+    """Cache of the operation definitions resolved from the context."""
+
+    def get_op_def(self, name: str) -> type[Operation]:
+        """Get the operation definition of the given name from the context."""
+        op_def = self.op_defs.get(name)
+        if op_def is None:
+            op_def = self.ctx.get_op(name)
+            self.op_defs[name] = op_def
+        return op_def
 
     @op_type_rewrite_pattern
     def match_and_rewrite(self, op: OperationOp, rewriter: PatternRewriter):
         # Get the corresponding op definition from the context
-        if op.opName is None:
+        op_name = op.opName
+        if op_name is None:
             raise Exception("Cannot handle non-constant op names")
-        op_def = self.ctx.get_op(op.opName.data)
+        op_def = self.get_op_def(op_name.data)
+        operand_values = op.operand_values
+        attribute_values = op.attribute_values
+        rewrite_context = self.rewrite_context
 
         # Create the with the given operands and types
         result_types = [_get_type_of_erased_type_value(type) for type in op.type_values]
@@ -173,7 +313,7 @@ class OperationRewrite(RewritePattern):
         if op_def in SMTLowerer.op_semantics:
             attributes = {
                 name.data: attr
-                for name, attr in zip(op.attributeValueNames, op.attribute_values)
+                for name, attr in zip(op.attributeValueNames, attribute_values)
             }
 
             # If we are manipulating a created operation, we use the effect states of the rewriting part.
@@ -183,11 +323,11 @@ class OperationRewrite(RewritePattern):
             is_created = "is_created" in op.attributes
             is_deleted = "is_deleted" in op.attributes
             if is_created:
-                effect_states = self.rewrite_context.rewriting_effect_states
+                effect_states = rewrite_context.rewriting_effect_states
             else:
-                effect_states = self.rewrite_context.matching_effect_states
+                effect_states = rewrite_context.matching_effect_states
             results, new_effect_states = SMTLowerer.op_semantics[op_def].get_semantics(
-                op.operand_values,
+                operand_values,
                 result_types,
                 attributes,
                 effect_states,
@@ -196,38 +336,39 @@ class OperationRewrite(RewritePattern):
 
             # Update the correct effect states.
             if is_deleted:
-                self.rewrite_context.matching_effect_states = new_effect_states
+                rewrite_context.matching_effect_states = new_effect_states
             elif is_created:
-                self.rewrite_context.rewriting_effect_states = new_effect_states
+                rewrite_context.rewriting_effect_states = new_effect_states
             else:
-                self.rewrite_context.matching_effect_states = new_effect_states
-                self.rewrite_context.rewriting_effect_states = new_effect_states
+                rewrite_context.matching_effect_states = new_effect_states
+                rewrite_context.rewriting_effect_states = new_effect_states
 
-            self.rewrite_context.pdl_op_to_values[op.op] = results
+            rewrite_context.pdl_op_to_values[op.op] = results
             rewriter.erase_matched_op(safe_erase=False)
             return
 
-        if op.attribute_values:
+        if attribute_values:
             raise Exception(
-                f"operation {op.opName} is used with attributes, "
+                f"operation {op_name} is used with attributes, "
                 "but no semantics are defined for this operation"
             )
 
         synthesized_op = op_def.create(
-            operands=op.operand_values, result_types=result_types
+            operands=operand_values, result_types=result_types
         )
 
-        # Cursed hack: we create a new module with that operation, and
-        # we rewrite it with the arith_to_smt and comb_to_smt pass.
-        rewrite_module = ModuleOp([synthesized_op])
-        LowerToSMTPass().apply(self.ctx, rewrite_module)
-        last_op = rewrite_module.body.block.last_op
-        assert last_op is not None
+        # Lower the operation in place, right before the matched operation.
+        # The operation is inserted without notifying the rewriter, as it is
+        # replaced during its lowering.
+        previous_op = op.prev_op
+        Rewriter.insert_op(synthesized_op, InsertPoint.before(op))
+        SMTLowerer.lower_operation(synthesized_op, EffectStates({}))
+        last_op = op.prev_op
+        assert last_op is not None and last_op is not previous_op
 
         # Set the operation carrying the results in the context
         # FIXME: this does not work if the last operation does not return all results
-        self.rewrite_context.pdl_op_to_values[op.op] = last_op.results
-        rewriter.inline_block_before_matched_op(rewrite_module.body.blocks[0])
+        rewrite_context.pdl_op_to_values[op.op] = last_op.results
 
         rewriter.erase_matched_op(safe_erase=False)
 
@@ -268,24 +409,12 @@ class ReplaceRewrite(RewritePattern):
             self.rewrite_context.rewriting_effect_states,
             rewriter,
         )
-        not_refinement = NotOp(refinement_value)
-        rewriter.insert_op_before_matched_op(not_refinement)
-        not_refinement_value = not_refinement.res
-
-        if len(self.rewrite_context.preconditions) == 0:
-            assert_op = AssertOp(not_refinement_value)
-            rewriter.replace_matched_op([assert_op])
-            return
-
-        and_preconditions = self.rewrite_context.preconditions[0]
-        for precondition in self.rewrite_context.preconditions[1:]:
-            and_preconditions_op = AndOp(and_preconditions, precondition)
-            rewriter.insert_op_before_matched_op(and_preconditions_op)
-            and_preconditions = and_preconditions_op.res
+        not_refinement = _smt_not(refinement_value, rewriter)
 
-        replace_correct = AndOp(not_refinement_value, and_preconditions)
-        assert_op = AssertOp(replace_correct.res)
-        rewriter.replace_matched_op([replace_correct, assert_op])
+        and_preconditions = get_and_preconditions(self.rewrite_context, rewriter)
+        if and_preconditions is not None:
+            not_refinement = _smt_and(not_refinement, and_preconditions, rewriter)
+        rewriter.replace_matched_op([AssertOp(not_refinement)])
 
 
 @dataclass
@@ -301,41 +430,53 @@ class ResultRewrite(RewritePattern):
         rewriter.replace_matched_op([], new_results=[result])
 
 
+def _is_bv_zero(value: SSAValue) -> bool:
+    """Check if a value is a bitvector constant equal to zero."""
+    return (
+        isinstance(value.owner, smt_bv.ConstantOp) and value.owner.value.value.data == 0
+    )
+
+
 def kb_analysis_correct(
-    poisoned_value: SSAValue, zeros: SSAValue, ones: SSAValue
-) -> tuple[SSAValue, list[Operation]]:
+    poisoned_value: SSAValue,
+    zeros: SSAValue,
+    ones: SSAValue,
+    rewrite_context: PDLToSMTRewriteContext,
+    rewriter: PatternRewriter,
+) -> SSAValue:
+    """
+    Get the condition for the known-bits analysis given by `zeros` and `ones` to
+    be correct for `poisoned_value`. The necessary operations are inserted before
+    the matched operation.
+    """
     assert isa(poisoned_value.type, smt_utils.PairType[smt_bv.BitVectorType, BoolType])
 
-    value_op = smt_utils.FirstOp(poisoned_value)
-    value = value_op.res
+    value, poison = get_int_value_and_poison(poisoned_value, rewriter)
     assert isinstance(value.type, smt_bv.BitVectorType)
 
-    poison_op = smt_utils.SecondOp(poisoned_value)
-    poison = poison_op.res
     true_op = ConstantBoolOp.from_bool(True)
     poison_correct = EqOp(poison, true_op.res)
+    rewriter.insert_op_before_matched_op([true_op, poison_correct])
 
-    and_op_zeros = smt_bv.AndOp(value, zeros)
-    zero = smt_bv.ConstantOp(0, value.type.width.data)
-    zeros_correct = EqOp(and_op_zeros.res, zero.res)
-    and_op_ones = smt_bv.AndOp(value, ones)
-    ones_correct = EqOp(and_op_ones.res, ones)
-    value_correct = AndOp(zeros_correct.res, ones_correct.res)
-    correct = OrOp(poison_correct.res, value_correct.res)
-
-    return value_correct.res, [
-        value_op,
-        poison_op,
-        true_op,
-        poison_correct,
-        and_op_zeros,
-        zero,
-        zeros_correct,
-        and_op_ones,
-        ones_correct,
-        value_correct,
-        correct,
-    ]
+    # `value & 0 == 0` always holds, so a constant zero mask is trivially correct.
+    conditions: list[SSAValue] = []
+    if not _is_bv_zero(zeros):
+        and_op_zeros = smt_bv.AndOp(value, zeros)
+        zero = rewrite_context.get_bv_zero(value.type.width.data)
+        zeros_correct = EqOp(and_op_zeros.res, zero)
+        rewriter.insert_op_before_matched_op([and_op_zeros, zeros_correct])
+        conditions.append(zeros_correct.res)
+    if not _is_bv_zero(ones):
+        and_op_ones = smt_bv.AndOp(value, ones)
+        ones_correct = EqOp(and_op_ones.res, ones)
+        rewriter.insert_op_before_matched_op([and_op_ones, ones_correct])
+        conditions.append(ones_correct.res)
+
+    value_correct = _reduce_and(conditions, rewriter)
+    correct = OrOp(poison_correct.res, value_correct)
+    rewriter.insert_op_before_matched_op(correct)
+
+    return value_correct
 
 
 @dataclass
@@ -353,17 +494,13 @@ class GetOpRewrite(RewritePattern):
         zeros = zeros_op.res
         ones = ones_op.res
 
-        all_correct, correct_ops = kb_analysis_correct(value, zeros, ones)
+        rewriter.insert_op_before_matched_op([zeros_op, ones_op])
+        all_correct = kb_analysis_correct(
+            value, zeros, ones, self.rewrite_context, rewriter
+        )
         self.rewrite_context.preconditions.append(all_correct)
 
-        rewriter.replace_matched_op(
-            [
-                zeros_op,
-                ones_op,
-                *correct_ops,
-            ],
-            new_results=[zeros, ones],
-        )
+        rewriter.replace_matched_op([], new_results=[zeros, ones])
         name = op.value.name_hint if op.value.name_hint else "value"
         zeros.name_hint = name + "_zeros"
         ones.name_hint = name + "_ones"
@@ -378,27 +515,17 @@ class AttachOpRewrite(RewritePattern):
         assert len(op.domains) == 2
         zeros, ones = op.domains
 
-        analysis_correct, analysis_correct_ops = kb_analysis_correct(
-            op.value, zeros, ones
+        analysis_correct = kb_analysis_correct(
+            op.value, zeros, ones, self.rewrite_context, rewriter
         )
-        rewriter.insert_op_before_matched_op(analysis_correct_ops)
-        analysis_incorrect_op = NotOp.get(analysis_correct)
-        rewriter.insert_op_before_matched_op(analysis_incorrect_op)
-        analysis_incorrect = analysis_incorrect_op.res
+        analysis_incorrect = _smt_not(analysis_correct, rewriter)
 
-        if len(self.rewrite_context.preconditions) == 0:
-            rewriter.replace_matched_op(AssertOp(analysis_incorrect))
-            return
-
-        and_preconditions = self.rewrite_context.preconditions[0]
-        for precondition in self.rewrite_context.preconditions[1:]:
-            and_preconditions_op = AndOp(and_preconditions, precondition)
-            rewriter.insert_op_before_matched_op(and_preconditions_op)
-            and_preconditions = and_preconditions_op.res
-
-        implies = AndOp(and_preconditions, analysis_incorrect)
-        rewriter.insert_op_before_matched_op(implies)
-        rewriter.replace_matched_op(AssertOp(implies.res))
+        and_preconditions = get_and_preconditions(self.rewrite_context, rewriter)
+        if and_preconditions is not None:
+            analysis_incorrect = _smt_and(
+                and_preconditions, analysis_incorrect, rewriter
+            )
+        rewriter.replace_matched_op(AssertOp(analysis_incorrect))
 
 
 @dataclass
@@ -462,6 +589,23 @@ class ComputationOpRewrite(RewritePattern):
             ), "Operations used as computations in PDL should not have effects"
 
 
+@dataclass
+class OpTypeDispatchRewritePattern(RewritePattern):
+    """
+    Apply the rewrite pattern associated with the operation type, or the
+    fallback pattern if there is none. Compared to trying all patterns in
+    sequence, this only calls a single pattern per operation.
+    """
+
+    patterns: dict[type[Operation], RewritePattern]
+    fallback: RewritePattern | None = None
+
+    def match_and_rewrite(self, op: Operation, rewriter: PatternRewriter):
+        pattern = self.patterns.get(type(op), self.fallback)
+        if pattern is not None:
+            pattern.match_and_rewrite(op, rewriter)
+
+
 @dataclass
 class PDLToSMTLowerer:
     native_rewrites: dict[
@@ -532,6 +676,7 @@ class PDLToSMTLowerer:
         self.mark_pdl_operations(pattern)
 
         rewrite_context = PDLToSMTRewriteContext({})
+        rewrite_context.constants_block = pattern.body.blocks[0]
 
         # Set the input effect states
         input_effect_states: dict[Attribute, SSAValue] = {}
@@ -544,25 +689,27 @@ class PDLToSMTLowerer:
         rewrite_context.rewriting_effect_states = EffectStates(input_effect_states)
 
         walker = PatternRewriteWalker(
-            GreedyRewritePatternApplier(
-                [
-                    RewriteRewrite(),
-                    TypeRewrite(rewrite_context),
-                    AttributeRewrite(),
-                    OperandRewrite(),
-                    GetOpRewrite(rewrite_context),
-                    OperationRewrite(ctx, rewrite_context),
-                    ReplaceRewrite(rewrite_context, self.refinement),
-                    ResultRewrite(rewrite_context),
-                    AttachOpRewrite(rewrite_context),
-                    ApplyNativeRewriteRewrite(rewrite_context, self.native_rewrites),
-                    ApplyNativeConstraintRewrite(
+            OpTypeDispatchRewritePattern(
+                {
+                    RewriteOp: RewriteRewrite(),
+                    TypeOp: TypeRewrite(rewrite_context),
+                    AttributeOp: AttributeRewrite(),
+                    OperandOp: OperandRewrite(),
+                    pdl_dataflow.GetOp: GetOpRewrite(rewrite_context),
+                    OperationOp: OperationRewrite(ctx, rewrite_context),
+                    ReplaceOp: ReplaceRewrite(rewrite_context, self.refinement),
+                    ResultOp: ResultRewrite(rewrite_context),
+                    pdl_dataflow.AttachOp: AttachOpRewrite(rewrite_context),
+                    ApplyNativeRewriteOp: ApplyNativeRewriteRewrite(
+                        rewrite_context, self.native_rewrites
+                    ),
+                    ApplyNativeConstraintOp: ApplyNativeConstraintRewrite(
                         rewrite_context,
                         self.native_constraints,
                         self.native_static_constraints,
                     ),
-                    ComputationOpRewrite(),
-                ]
+                },
+                ComputationOpRewrite(),
             )
         )
         try:
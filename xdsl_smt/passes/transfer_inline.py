@@ -1,15 +1,9 @@
 from dataclasses import dataclass
-from xdsl.pattern_rewriter import (
-    PatternRewriter,
-    RewritePattern,
-    op_type_rewrite_pattern,
-)
-from xdsl.ir import Operation
+from xdsl.pattern_rewriter import op_type_rewrite_pattern
 
 from xdsl_smt.dialects.smt_dialect import CallOp, DefineFunOp, ReturnOp
 from xdsl.dialects.builtin import ModuleOp
 from xdsl.dialects.func import FuncOp, Call, Return
-from xdsl.ir import Operation
 from xdsl.context import MLContext
 from xdsl.ir import Operation, SSAValue
 from xdsl.passes import ModulePass
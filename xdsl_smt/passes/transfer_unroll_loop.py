@@ -1,9 +1,5 @@
 from dataclasses import dataclass
-from xdsl.pattern_rewriter import (
-    PatternRewriter,
-    RewritePattern,
-    op_type_rewrite_pattern,
-)
+from xdsl.pattern_rewriter import op_type_rewrite_pattern
 
 from ..dialects import transfer
 from xdsl.dialects.builtin import ModuleOp
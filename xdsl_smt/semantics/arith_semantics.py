@@ -20,12 +20,27 @@ import xdsl.dialects.arith as arith
 def get_int_value_and_poison(
     val: SSAValue, rewriter: PatternRewriter
 ) -> tuple[SSAValue, SSAValue]:
+    """
+    Get the value and poison flag of an integer. If the integer is directly
+    constructed by a `PairOp`, its operands are returned instead of inserting
+    projections.
+    """
+    if isinstance(pair := val.owner, smt_utils.PairOp):
+        return pair.first, pair.second
     value = smt_utils.FirstOp(val)
     poison = smt_utils.SecondOp(val)
     rewriter.insert_op_before_matched_op([value, poison])
     return value.res, poison.res
 
 
+def is_never_poison(val: SSAValue) -> bool:
+    """Check if an integer value is syntactically known to not be poison."""
+    if not isinstance(pair := val.owner, smt_utils.PairOp):
+        return False
+    poison = pair.second.owner
+    return isinstance(poison, smt.ConstantBoolOp) and not poison.value.data
+
+
 def reduce_poison_values(
     operands: Sequence[SSAValue], rewriter: PatternRewriter
 ) -> tuple[Sequence[SSAValue], SSAValue]:
@@ -34,16 +49,35 @@ def reduce_poison_values(
         rewriter.insert_op_before_matched_op([no_poison_op])
         return operands, no_poison_op.res
 
+    # Build the poison merging operations first, and insert them at once.
+    # Operands used multiple times are only projected, and their poison only
+    # merged, once. Operands that are known to not be poison do not contribute
+    # to the resulting poison.
+    new_ops = list[Operation]()
     values = list[SSAValue]()
-    value, result_poison = get_int_value_and_poison(operands[0], rewriter)
-    values.append(value)
-
-    for operand in operands[1:]:
+    projections: dict[SSAValue, SSAValue] = {}
+    result_poison: SSAValue | None = None
+    for operand in operands:
+        if (value := projections.get(operand)) is not None:
+            values.append(value)
+            continue
         value, poison = get_int_value_and_poison(operand, rewriter)
+        projections[operand] = value
         values.append(value)
-        merge_poison = smt.OrOp(result_poison, poison)
-        result_poison = merge_poison.res
-        rewriter.insert_op_before_matched_op(merge_poison)
+        if is_never_poison(operand):
+            continue
+        if result_poison is None:
+            result_poison = poison
+        else:
+            merge_poison = smt.OrOp(result_poison, poison)
+            new_ops.append(merge_poison)
+            result_poison = merge_poison.res
+
+    if result_poison is None:
+        no_poison_op = smt.ConstantBoolOp(False)
+        new_ops.append(no_poison_op)
+        result_poison = no_poison_op.res
+    rewriter.insert_op_before_matched_op(new_ops)
 
     return values, result_poison
 
@@ -182,8 +216,12 @@ class MulSIExtendedSemantics(SimplePurePoisonSemantics):
         assert isinstance(results[1], IntegerType)
         width = results[0].width.data
 
-        lhs_extend = smt_bv.SignExtendOp(operands[0], smt_bv.BitVectorType(width * 2))
-        rhs_extend = smt_bv.SignExtendOp(operands[1], smt_bv.BitVectorType(width * 2))
+        lhs_extend = smt_bv.SignExtendOp(
+            operands[0], smt_bv.BitVectorType.from_int(width * 2)
+        )
+        rhs_extend = smt_bv.SignExtendOp(
+            operands[1], smt_bv.BitVectorType.from_int(width * 2)
+        )
 
         res_extend = smt_bv.MulOp(lhs_extend.res, rhs_extend.res)
 
@@ -208,8 +246,12 @@ class MulUIExtendedSemantics(SimplePurePoisonSemantics):
         assert isinstance(results[1], IntegerType)
         width = results[0].width.data
 
-        lhs_extend = smt_bv.ZeroExtendOp(operands[0], smt_bv.BitVectorType(width * 2))
-        rhs_extend = smt_bv.ZeroExtendOp(operands[1], smt_bv.BitVectorType(width * 2))
+        lhs_extend = smt_bv.ZeroExtendOp(
+            operands[0], smt_bv.BitVectorType.from_int(width * 2)
+        )
+        rhs_extend = smt_bv.ZeroExtendOp(
+            operands[1], smt_bv.BitVectorType.from_int(width * 2)
+        )
 
         res_extend = smt_bv.MulOp(lhs_extend.res, rhs_extend.res)
 
@@ -645,7 +687,7 @@ class ExtUISemantics(SimplePurePoisonSemantics):
         assert isinstance(results[0], IntegerType)
         new_width = results[0].width.data
 
-        op = smt_bv.ZeroExtendOp(operands[0], smt_bv.BitVectorType(new_width))
+        op = smt_bv.ZeroExtendOp(operands[0], smt_bv.BitVectorType.from_int(new_width))
         rewriter.insert_op_before_matched_op([op])
         return ((op.res, None),)
 
@@ -661,7 +703,7 @@ class ExtSISemantics(SimplePurePoisonSemantics):
         assert isinstance(results[0], IntegerType)
         new_width = results[0].width.data
 
-        op = smt_bv.SignExtendOp(operands[0], smt_bv.BitVectorType(new_width))
+        op = smt_bv.SignExtendOp(operands[0], smt_bv.BitVectorType.from_int(new_width))
         rewriter.insert_op_before_matched_op([op])
         return ((op.res, None),)
 
@@ -1,10 +1,11 @@
-from typing import Mapping, Sequence
+from functools import reduce
+from typing import Callable, Mapping, Sequence
 from dataclasses import dataclass
 from xdsl.utils.hints import isa
 from xdsl.pattern_rewriter import (
     PatternRewriter,
 )
-from xdsl.ir import Attribute, Operation, SSAValue
+from xdsl.ir import Attribute, OpResult, Operation, SSAValue
 from xdsl.irdl import IRDLOperation
 from xdsl.dialects.builtin import AnyIntegerAttr, IntegerAttr, IntegerType
 import xdsl.dialects.comb as comb
@@ -17,6 +18,7 @@ from xdsl_smt.passes.lower_to_smt import SMTLowerer
 from xdsl_smt.semantics.builtin_semantics import IntegerAttrSemantics
 from xdsl_smt.semantics.semantics import EffectStates, OperationSemantics
 from xdsl_smt.semantics.arith_semantics import SimplePurePoisonSemantics
+from xdsl_smt.utils.rewrite_tools import get_bv_constant
 
 
 def cast_integer_type(
@@ -37,6 +39,100 @@ def cast_integer_type(
     return concat_op.res
 
 
+def is_same_value(lhs: SSAValue, rhs: SSAValue) -> bool:
+    """
+    Check if two values are known to be equal.
+    Looks through the projections of a same (value, poison) pair.
+    """
+    if lhs == rhs:
+        return True
+    if not isinstance(lhs, OpResult) or not isinstance(rhs, OpResult):
+        return False
+    if isinstance(lhs.op, smt_utils.FirstOp) and isinstance(rhs.op, smt_utils.FirstOp):
+        return lhs.op.pair == rhs.op.pair
+    return False
+
+
+_constant_folders: dict[type[Operation], Callable[[int, int], int]] = {
+    smt_bv.AddOp: lambda lhs, rhs: lhs + rhs,
+    smt_bv.SubOp: lambda lhs, rhs: lhs - rhs,
+    smt_bv.MulOp: lambda lhs, rhs: lhs * rhs,
+    smt_bv.AndOp: lambda lhs, rhs: lhs & rhs,
+    smt_bv.OrOp: lambda lhs, rhs: lhs | rhs,
+    smt_bv.XorOp: lambda lhs, rhs: lhs ^ rhs,
+}
+
+
+def fold_binop(
+    smt_op_type: type[Operation],
+    lhs: SSAValue,
+    rhs: SSAValue,
+    rewriter: PatternRewriter,
+) -> SSAValue | None:
+    """
+    Fold a binary bitvector operation if both operands are constants, or if
+    an algebraic identity applies. Returns None if no folding is possible.
+    """
+    assert isinstance(lhs.type, smt_bv.BitVectorType)
+    width = lhs.type.width.data
+    all_ones = 2**width - 1
+    lhs_value = get_bv_constant(lhs)
+    rhs_value = get_bv_constant(rhs)
+
+    def constant(value: int) -> SSAValue:
+        constant_op = smt_bv.ConstantOp(value, width)
+        rewriter.insert_op_before_matched_op(constant_op)
+        return constant_op.res
+
+    # c1 op c2 -> c3
+    if lhs_value is not None and rhs_value is not None:
+        if (folder := _constant_folders.get(smt_op_type)) is not None:
+            return constant(folder(lhs_value, rhs_value) & all_ones)
+
+    # x + 0 -> x, x | 0 -> x, x ^ 0 -> x
+    if smt_op_type in (smt_bv.AddOp, smt_bv.OrOp, smt_bv.XorOp):
+        if lhs_value == 0:
+            return rhs
+        if rhs_value == 0:
+            return lhs
+
+    # x * 0 -> 0, x * 1 -> x
+    if smt_op_type is smt_bv.MulOp:
+        if lhs_value == 0 or rhs_value == 1:
+            return lhs
+        if rhs_value == 0 or lhs_value == 1:
+            return rhs
+
+    # x & 0 -> 0, x & -1 -> x
+    if smt_op_type is smt_bv.AndOp:
+        if lhs_value == 0 or rhs_value == all_ones:
+            return lhs
+        if rhs_value == 0 or lhs_value == all_ones:
+            return rhs
+
+    # x | -1 -> -1
+    if smt_op_type is smt_bv.OrOp:
+        if lhs_value == all_ones:
+            return lhs
+        if rhs_value == all_ones:
+            return rhs
+
+    # x - 0 -> x, x << 0 -> x, x >> 0 -> x
+    if smt_op_type in (smt_bv.SubOp, smt_bv.ShlOp, smt_bv.LShrOp, smt_bv.AShrOp):
+        if rhs_value == 0:
+            return lhs
+
+    # x - x -> 0, x ^ x -> 0
+    if smt_op_type in (smt_bv.SubOp, smt_bv.XorOp) and is_same_value(lhs, rhs):
+        return constant(0)
+
+    # x & x -> x, x | x -> x
+    if smt_op_type in (smt_bv.AndOp, smt_bv.OrOp) and is_same_value(lhs, rhs):
+        return lhs
+
+    return None
+
+
 class ConstantSemantics(OperationSemantics):
     def get_semantics(
         self,
@@ -77,17 +173,54 @@ class VariadicSemantics(SimplePurePoisonSemantics):
             rewriter.insert_op_before_matched_op(constant)
             return ((constant.res, None),)
 
-        current_val = operands[0]
-
-        for operand in operands[1:]:
+        # If all operands are constants, fold them at once into a single constant.
+        if (folder := _constant_folders.get(self.smt_op_type)) is not None:
+            constant_values: list[int] = []
+            for operand in operands:
+                if (value := get_bv_constant(operand)) is None:
+                    break
+                constant_values.append(value)
+            else:
+                width = res_type.first.width.data
+                folded = reduce(folder, constant_values)
+                constant = smt_bv.ConstantOp(folded & (2**width - 1), width)
+                rewriter.insert_op_before_matched_op(constant)
+                return ((constant.res, None),)
+
+        # Reduce the operands as a balanced tree, combining adjacent operands
+        # to preserve their order. This keeps the expression depth logarithmic
+        # in the number of operands.
+        values = list(operands)
+        while len(values) > 1:
+            next_values: list[SSAValue] = []
+            for lhs, rhs in zip(values[::2], values[1::2]):
+                next_values.append(self.combine(lhs, rhs, res_type.first, rewriter))
+            if len(values) % 2 == 1:
+                next_values.append(values[-1])
+            values = next_values
+
+        return ((values[0], None),)
+
+    def combine(
+        self,
+        lhs: SSAValue,
+        rhs: SSAValue,
+        res_type: smt_bv.BitVectorType,
+        rewriter: PatternRewriter,
+    ) -> SSAValue:
+        """Combine two operands, folding constants and identities when possible."""
+        new_op: Operation
+        # Concatenation changes the bitwidth, so partial results have their own type.
+        if self.smt_op_type is smt_bv.ConcatOp:
+            new_op = smt_bv.ConcatOp(lhs, rhs)
+        else:
+            if (folded := fold_binop(self.smt_op_type, lhs, rhs, rewriter)) is not None:
+                return folded
             new_op = self.smt_op_type.create(
-                operands=[current_val, operand],
-                result_types=[res_type.first],
+                operands=[lhs, rhs], result_types=[res_type]
             )
-            current_val = new_op.results[0]
-            rewriter.insert_op_before_matched_op(new_op)
-
-        return ((current_val, None),)
+        rewriter.insert_op_before_matched_op(new_op)
+        return new_op.results[0]
 
 
 @dataclass
@@ -103,9 +236,13 @@ class TrivialBinOpSemantics(SimplePurePoisonSemantics):
         rewriter: PatternRewriter,
     ) -> Sequence[tuple[SSAValue, SSAValue | None]]:
         assert isinstance(result := results[0], IntegerType)
+        if (
+            folded := fold_binop(self.smt_op_type, operands[0], operands[1], rewriter)
+        ) is not None:
+            return ((folded, None),)
         new_op = self.smt_op_type.create(
             operands=operands,
-            result_types=[smt_bv.BitVectorType(result.width)],
+            result_types=[smt_bv.BitVectorType.from_int(result.width.data)],
         )
         rewriter.insert_op_before_matched_op([new_op])
         return ((new_op.results[0], None),)
@@ -23,15 +23,6 @@ class IntegerTypeRefinementSemantics(RefinementSemantics):
         before_val = smt_utils.FirstOp(val_before)
         after_val = smt_utils.FirstOp(val_after)
 
-        rewriter.insert_op_before_matched_op(
-            [
-                before_poison,
-                after_poison,
-                before_val,
-                after_val,
-            ]
-        )
-
         not_before_poison = smt.NotOp(before_poison.res)
         not_after_poison = smt.NotOp(after_poison.res)
         eq_vals = smt.EqOp(before_val.res, after_val.res)
@@ -39,6 +30,10 @@ class IntegerTypeRefinementSemantics(RefinementSemantics):
         refinement_integer = smt.ImpliesOp(not_before_poison.res, not_poison_eq.res)
         rewriter.insert_op_before_matched_op(
             [
+                before_poison,
+                after_poison,
+                before_val,
+                after_val,
                 not_before_poison,
                 not_after_poison,
                 eq_vals,
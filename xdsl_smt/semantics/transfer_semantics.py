@@ -2,7 +2,6 @@ from dataclasses import dataclass
 from xdsl.pattern_rewriter import (
     PatternRewriter,
 )
-from xdsl.ir import Operation
 
 from xdsl_smt.dialects import smt_bitvector_dialect as smt_bv
 from xdsl_smt.dialects import smt_dialect as smt
@@ -61,7 +60,7 @@ def transfer_integer_type_lowerer(
     type: Attribute, width: int
 ) -> smt_bv.BitVectorType | None:
     if isinstance(type, transfer.TransIntegerType):
-        return smt_bv.BitVectorType(width)
+        return smt_bv.BitVectorType.from_int(width)
     return None
 
 
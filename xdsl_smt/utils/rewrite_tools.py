@@ -1,6 +1,9 @@
 from typing import Iterable
 
-from xdsl.ir import Operation, OpResult
+from xdsl.ir import Operation, OpResult, SSAValue
+
+from ..dialects import smt_bitvector_dialect as smt_bv
+from ..dialects import smt_utils_dialect as smt_utils
 
 
 def new_ops(op: Operation) -> Iterable[Operation]:
@@ -11,3 +14,17 @@ def new_ops(op: Operation) -> Iterable[Operation]:
             if isinstance(child_op, OpResult):
                 yield from new_ops(child_op.op)
         yield op
+
+
+def get_bv_constant(value: SSAValue) -> int | None:
+    """
+    Get the value of a bitvector constant, if the value is one.
+    Looks through the projection of a (value, poison) pair.
+    """
+    if isinstance(value, OpResult) and isinstance(value.op, smt_utils.FirstOp):
+        pair = value.op.pair
+        if isinstance(pair, OpResult) and isinstance(pair.op, smt_utils.PairOp):
+            value = pair.op.first
+    if isinstance(value, OpResult) and isinstance(value.op, smt_bv.ConstantOp):
+        return value.op.value.value.data
+    return None
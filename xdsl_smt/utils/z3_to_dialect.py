@@ -89,7 +89,7 @@ def z3_sort_to_dialect(expr: Any) -> Attribute:
     if isinstance(expr, BoolSortRef):
         return BoolType()
     if isinstance(expr, BitVecSortRef):
-        return BitVectorType(expr.size())
+        return BitVectorType.from_int(expr.size())
     raise ValueError(f"Cannot convert {expr} to an SMTLib sort")
 
 